@@ -2,13 +2,21 @@
 AI 분류 및 요약 (Gemini API 사용)
 """
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
+import hashlib
 import logging
 import json
+import os
 import re
+import threading
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import CATEGORIES
+import db
+import dedup
+from metrics import RunMetrics
+import ratelimit
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,34 +24,107 @@ logger = logging.getLogger(__name__)
 
 def _jaccard_similarity(text1: str, text2: str) -> float:
     """단어 집합 기반 Jaccard 유사도 (0~1)"""
-    if not text1 or not text2:
-        return 0.0
-    words1 = set(re.findall(r"\w+", text1.lower()))
-    words2 = set(re.findall(r"\w+", text2.lower()))
-    if not words1 or not words2:
-        return 0.0
-    intersection = words1 & words2
-    union = words1 | words2
-    return len(intersection) / len(union)
+    return dedup.jaccard(dedup.tokenize(text1), dedup.tokenize(text2))
 
 
-class AIProcessor:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+MODEL_NAME = "gemini-1.5-flash"
+# 카테고리 목록이 바뀌면 캐시 키가 바뀌어 이전 분류 결과를 재사용하지 않음
+CATEGORIES_VERSION = hashlib.sha256(
+    json.dumps(CATEGORIES, ensure_ascii=False).encode()
+).hexdigest()[:12]
+AI_CACHE_TTL = 30 * 24 * 3600  # 30일
+AI_CACHE_MAX_ENTRIES = 50000
+
+# 배치 프롬프트: 요청 하나에 넣는 최대 기사 수와 토큰 예산 (입력 + 예상 출력)
+BATCH_SIZE = 10
+BATCH_TOKEN_BUDGET = 12000
+OUTPUT_TOKENS_PER_ARTICLE = 300
+
+# Gemini 호출 예산 (분당 요청 수 / 분당 토큰 수)과 재시도
+AI_RPM = int(os.environ.get("GEMINI_RPM", "60"))
+AI_TPM = int(os.environ.get("GEMINI_TPM", "1000000"))
+AI_MAX_RETRIES = 4
+# 분류 결과로 기사에 채워지는 필드 (ai_error는 실패 시에만)
+RESULT_FIELDS = ("is_europe_relevant", "categories", "summary", "companies", "ai_error")
+# 재시도할 HTTP 상태 (요청 제한 / 일시적 서버 오류)
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """google.api_core 예외의 HTTP 상태 코드로 재시도 여부 판단"""
+    return getattr(error, "code", None) in RETRYABLE_CODES
+
+
+def _strip_code_fence(result_text: str) -> str:
+    """응답 앞뒤의 markdown code fence 제거"""
+    result_text = result_text.strip()
+    result_text = re.sub(r"^```[a-z]*\n?", "", result_text)
+    return re.sub(r"\n?```$", "", result_text)
+
+
+def _estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 추정 (4글자 ≈ 1토큰)"""
+    return len(text) // 4 + 1
+
+
+def _article_text(article: Dict) -> str:
+    """프롬프트에 넣을 기사 본문 (제목 + 내용, 3000자 제한)"""
+    return f"{article.get('title', '')}\n\n{article.get('content', '')}"[:3000]
+
+
+def _normalize_result(parsed: Dict) -> Dict:
+    """모델이 준 JSON 객체를 기사 필드 형식으로 정리"""
+    return {
+        "is_europe_relevant": bool(parsed.get("is_europe_relevant", False)),
+        "categories": [c for c in parsed.get("categories", []) if c in CATEGORIES],
+        "summary": str(parsed.get("summary", ""))[:200],
+        "companies": parsed.get("companies", []),
+    }
+
+
+def _parse_result(result_text: str) -> Optional[Dict]:
+    """Gemini 응답 텍스트에서 분류 결과 JSON 추출 (실패 시 None)"""
+    json_match = re.search(r"\{.*\}", _strip_code_fence(result_text), re.DOTALL)
+    if not json_match:
+        return None
+    return _normalize_result(json.loads(json_match.group()))
 
-    def _process_single(self, article: Dict) -> Dict:
-        """단일 기사를 Gemini로 분류·요약"""
-        title = article.get("title", "")
-        content = article.get("content", "")
-        text = f"{title}\n\n{content}"[:3000]
 
-        prompt = f"""You are a European tech news analyst.
+def _parse_batch_result(result_text: str) -> Dict[int, Dict]:
+    """배치 응답의 JSON 배열에서 index → 분류 결과 추출 (누락·파싱 실패 항목은 제외)"""
+    json_match = re.search(r"\[.*\]", _strip_code_fence(result_text), re.DOTALL)
+    if not json_match:
+        return {}
+    results = {}
+    for item in json.loads(json_match.group()):
+        try:
+            results[int(item["index"])] = _normalize_result(item)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return results
+
+
+class AIProcessor:
+    def __init__(self, api_key: str, use_cache: bool = True, max_concurrency: int = 8):
+        self.model = genai.GenerativeModel(MODEL_NAME)
+        # genai.configure는 프로세스 전역이고 모델은 첫 호출 때 그 설정으로 클라이언트를 만든다.
+        # 워커가 키별 AIProcessor를 캐시하므로 다른 사용자 키로 호출되지 않도록 이 키의 클라이언트를 묶어 둔다.
+        self.model._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+        self.limiter = ratelimit.get_limiter("gemini", AI_RPM, AI_TPM, max_concurrency)
+        self.use_cache = use_cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _build_prompt(article: Dict) -> str:
+        """단일 기사 분류 프롬프트 생성"""
+        return f"""You are a European tech news analyst.
 
 Analyze the following article and respond ONLY with valid JSON (no markdown, no code blocks).
 
 Article:
-{text}
+{_article_text(article)}
 
 Categories to choose from:
 {json.dumps(CATEGORIES, ensure_ascii=False)}
@@ -56,52 +137,165 @@ JSON schema:
   "companies": [<list of European company names mentioned>]
 }}"""
 
+    @staticmethod
+    def _build_batch_prompt(articles: List[Dict]) -> str:
+        """여러 기사를 index로 구분해 한 번에 분류하는 프롬프트 생성"""
+        blocks = "\n\n".join(
+            f"[Article {i}]\n{_article_text(article)}" for i, article in enumerate(articles)
+        )
+        return f"""You are a European tech news analyst.
+
+Analyze each of the following {len(articles)} articles and respond ONLY with a valid JSON array (no markdown, no code blocks) containing one object per article.
+
+{blocks}
+
+Categories to choose from:
+{json.dumps(CATEGORIES, ensure_ascii=False)}
+
+JSON schema of each array element:
+{{
+  "index": <article number from the [Article N] header>,
+  "is_europe_relevant": <true if the article involves a European company or European market, false otherwise>,
+  "categories": [<list of matching category strings from the list above, can be multiple>],
+  "summary": "<200-character Korean summary>",
+  "companies": [<list of European company names mentioned>]
+}}"""
+
+    @staticmethod
+    def _cache_key(prompt: str) -> str:
+        """프롬프트·모델·카테고리 버전 기반 캐시 키"""
+        return hashlib.sha256(
+            f"{MODEL_NAME}\n{CATEGORIES_VERSION}\n{prompt}".encode()
+        ).hexdigest()
+
+    def _count(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _generate(
+        self, prompt: str, expected_output_tokens: int, metrics: Optional[RunMetrics] = None
+    ) -> str:
+        """속도 제한기를 거쳐 Gemini 호출, 429/5xx는 jitter 백오프로 재시도
+
+        metrics가 있으면 요청마다 지연 시간·토큰 수(응답의 usage_metadata, 없으면 추정치)와
+        속도 제한 대기 시간을 기록한다.
+        """
+        prompt_tokens = _estimate_tokens(prompt)
+        tokens = prompt_tokens + expected_output_tokens
+        for attempt in range(AI_MAX_RETRIES + 1):
+            waited = time.perf_counter()
+            self.limiter.acquire(tokens)
+            started = time.perf_counter()
+            if metrics:
+                metrics.observe("ai_wait", started - waited)
+            try:
+                response = self.model.generate_content(prompt)
+                # 차단된 응답 등은 .text에서 예외가 나므로 성공 기록 전에 읽음 (호출이 두 번 기록되지 않도록)
+                text = response.text
+                self.limiter.on_success()
+                if metrics:
+                    usage = getattr(response, "usage_metadata", None)
+                    metrics.record_ai_call(
+                        time.perf_counter() - started,
+                        getattr(usage, "prompt_token_count", None) or prompt_tokens,
+                        getattr(usage, "candidates_token_count", None) or 0,
+                        retry=attempt > 0,
+                    )
+                return text
+            except Exception as e:
+                if metrics:
+                    metrics.record_ai_call(
+                        time.perf_counter() - started, prompt_tokens, 0, retry=attempt > 0
+                    )
+                if not _is_retryable(e) or attempt == AI_MAX_RETRIES:
+                    raise
+                self.limiter.on_throttle()
+                delay = ratelimit.backoff_delay(attempt)
+                logger.warning(f"🔁 AI 재시도 {attempt + 1}/{AI_MAX_RETRIES} ({delay:.1f}s 후): {str(e)[:60]}")
+            finally:
+                self.limiter.release()
+            time.sleep(delay)
+
+    @staticmethod
+    def _mark_error(article: Dict, error: str):
+        """분류 실패 표시 (유럽 무관 판정과 구분되도록 ai_error 설정)"""
+        article["is_europe_relevant"] = False
+        article["categories"] = []
+        article["summary"] = ""
+        article["companies"] = []
+        article["ai_error"] = error
+
+    def _process_single(
+        self, article: Dict, check_cache: bool = True, metrics: Optional[RunMetrics] = None
+    ) -> Dict:
+        """단일 기사를 Gemini로 분류·요약 (동일 프롬프트 결과는 캐시 재사용)
+
+        호출이나 JSON 파싱에 실패하면 article["ai_error"]에 사유를 남긴다.
+        """
+        title = article.get("title", "")
+        prompt = self._build_prompt(article)
+        key = self._cache_key(prompt)
+
+        if check_cache and self._lookup_cached(article):
+            logger.info(f"♻️ {title[:50]} → {article['categories']} (캐시)")
+            return article
+
         try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            # Strip markdown code fences if present
-            result_text = re.sub(r"^```[a-z]*\n?", "", result_text)
-            result_text = re.sub(r"\n?```$", "", result_text)
-            json_match = re.search(r"\{.*\}", result_text, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                article["is_europe_relevant"] = bool(parsed.get("is_europe_relevant", False))
-                article["categories"] = [
-                    c for c in parsed.get("categories", []) if c in CATEGORIES
-                ]
-                article["summary"] = str(parsed.get("summary", ""))[:200]
-                article["companies"] = parsed.get("companies", [])
+            parsed = _parse_result(self._generate(prompt, OUTPUT_TOKENS_PER_ARTICLE, metrics))
+            if parsed:
+                article.update(parsed)
+                article.pop("ai_error", None)
+                if self.use_cache:
+                    db.put_ai_cache(key, parsed)
                 logger.info(f"✅ {title[:50]} → {article['categories']}")
             else:
                 logger.warning(f"⚠️ JSON 파싱 실패: {title[:50]}")
-                article["is_europe_relevant"] = False
-                article["categories"] = []
-                article["summary"] = ""
-                article["companies"] = []
+                self._mark_error(article, "JSON 파싱 실패")
         except Exception as e:
             logger.error(f"❌ AI 오류: {str(e)[:80]}")
-            article["is_europe_relevant"] = False
-            article["categories"] = []
-            article["summary"] = ""
-            article["companies"] = []
+            self._mark_error(article, str(e)[:200])
 
         return article
 
+    def _log_cache_stats(self):
+        """캐시 hit/miss 기록 및 캐시 정리 (인스턴스를 재사용하므로 기록 후 카운터 초기화)"""
+        if not self.use_cache:
+            return
+        with self._stats_lock:
+            hits, misses = self.cache_hits, self.cache_misses
+            self.cache_hits = self.cache_misses = 0
+        total = hits + misses
+        rate = hits / total * 100 if total else 0.0
+        evicted = db.evict_ai_cache(AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL)
+        logger.info(
+            f"📊 AI 캐시 hit {hits} / miss {misses} "
+            f"({rate:.0f}%), 정리 {evicted}개"
+        )
+
+    def _log_errors(self, articles: List[Dict]):
+        errors = sum(1 for a in articles if a.get("ai_error"))
+        if errors:
+            logger.warning(f"⚠️ AI 분류 실패 {errors}/{len(articles)}건 (다음 크롤에서 재시도)")
+
     def process_articles(self, articles: List[Dict]) -> List[Dict]:
         """기사 목록을 순차 처리"""
         results = []
         for article in articles:
             results.append(self._process_single(article))
-            time.sleep(0.5)
+        self._log_cache_stats()
+        self._log_errors(results)
         return results
 
-    def process_articles_parallel(self, articles: List[Dict], max_workers: int = 5) -> List[Dict]:
-        """기사 목록을 병렬 처리 (rate-limit 보호를 위해 0.5s sleep 포함)"""
+    def process_articles_parallel(self, articles: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+        """기사 목록을 병렬 처리 (실제 요청 속도·동시성은 공유 RateLimiter가 제한)"""
         results: List[Dict] = [None] * len(articles)
+        max_workers = max_workers or self.limiter.max_concurrency
 
         def worker(idx_article):
             idx, article = idx_article
-            time.sleep(0.5)  # Gemini API 분당 요청 제한 보호
             return idx, self._process_single(article)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -115,10 +309,96 @@ JSON schema:
                 except Exception as e:
                     logger.error(f"❌ 병렬 처리 오류: {str(e)[:60]}")
 
-        return [r for r in results if r is not None]
+        self._log_cache_stats()
+        results = [r for r in results if r is not None]
+        self._log_errors(results)
+        return results
+
+    def _lookup_cached(self, article: Dict) -> bool:
+        """캐시에 결과가 있으면 기사에 채우고 True 반환"""
+        if not self.use_cache:
+            return False
+        cached = db.get_ai_cache(self._cache_key(self._build_prompt(article)), AI_CACHE_TTL)
+        self._count(cached is not None)
+        if cached is None:
+            return False
+        article.update(cached)
+        return True
+
+    def _process_batch(self, batch: List[Dict], metrics: Optional[RunMetrics] = None) -> List[Dict]:
+        """기사 묶음을 요청 하나로 분류, 응답에서 빠진 기사는 개별 요청으로 재시도"""
+        results: Dict[int, Dict] = {}
+        try:
+            results = _parse_batch_result(self._generate(
+                self._build_batch_prompt(batch), OUTPUT_TOKENS_PER_ARTICLE * len(batch), metrics
+            ))
+        except Exception as e:
+            logger.error(f"❌ AI 배치 오류 ({len(batch)}건): {str(e)[:80]}")
+
+        for i, article in enumerate(batch):
+            parsed = results.get(i)
+            if parsed is None:
+                self._process_single(article, check_cache=False, metrics=metrics)
+                continue
+            article.update(parsed)
+            article.pop("ai_error", None)
+            if self.use_cache:
+                db.put_ai_cache(self._cache_key(self._build_prompt(article)), parsed)
+            logger.info(f"✅ {article.get('title', '')[:50]} → {article['categories']}")
+
+        missing = len(batch) - len(results.keys() & set(range(len(batch))))
+        if missing:
+            logger.warning(f"⚠️ 배치 응답 누락 {missing}/{len(batch)}건 개별 재요청")
+        return batch
+
+    @staticmethod
+    def _make_batches(articles: List[Dict], batch_size: int, token_budget: int) -> List[List[Dict]]:
+        """기사 수(batch_size)와 토큰 예산을 넘지 않도록 순서대로 묶음 생성"""
+        overhead = _estimate_tokens(AIProcessor._build_batch_prompt([]))
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        used = overhead
+        for article in articles:
+            cost = _estimate_tokens(_article_text(article)) + OUTPUT_TOKENS_PER_ARTICLE
+            if current and (len(current) >= batch_size or used + cost > token_budget):
+                batches.append(current)
+                current, used = [], overhead
+            current.append(article)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def process_articles_batched(
+        self,
+        articles: List[Dict],
+        batch_size: int = BATCH_SIZE,
+        max_workers: Optional[int] = None,
+        token_budget: int = BATCH_TOKEN_BUDGET,
+        metrics: Optional[RunMetrics] = None,
+    ) -> List[Dict]:
+        """여러 기사를 한 프롬프트에 묶어 병렬 처리 (기사별 출력 형식은 _process_single과 동일)
+
+        metrics(metrics.RunMetrics)가 있으면 Gemini 요청별 지연 시간과 토큰 수를 기록한다.
+        """
+        max_workers = max_workers or self.limiter.max_concurrency
+        pending = [a for a in articles if not self._lookup_cached(a)]
+        batches = self._make_batches(pending, batch_size, token_budget)
+        logger.info(f"🤖 AI 배치 처리: {len(pending)}개 기사 → {len(batches)}개 요청")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._process_batch, batch, metrics) for batch in batches]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"❌ 배치 처리 오류: {str(e)[:60]}")
+
+        self._log_cache_stats()
+        results = [a for a in articles if "is_europe_relevant" in a]
+        self._log_errors(results)
+        return results
 
     def is_duplicate(self, article1: Dict, article2: Dict) -> bool:
-        """50% 이상 Jaccard 유사도이면 중복으로 간주"""
-        text1 = f"{article1.get('title', '')} {article1.get('content', '')}"
-        text2 = f"{article2.get('title', '')} {article2.get('content', '')}"
-        return _jaccard_similarity(text1, text2) >= 0.5
+        """50% 이상 Jaccard 유사도이면 중복으로 간주 (dedup 엔진과 동일 기준)"""
+        return dedup.is_duplicate(article1, article2)
@@ -3,15 +3,18 @@ Streamlit 웹 앱 - Samsung Electronics Europe IPC
 """
 import streamlit as st
 import hashlib
+import html
 import logging
 import os
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict
+from datetime import datetime, timezone
+from typing import Dict
 
 from config import CATEGORIES, WEBSITES
-import crawler
-from ai import AIProcessor, _jaccard_similarity
+import crawl_coverage
 import db
+import metrics
+from read_tracker import get_tracker
+from worker import get_worker
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,24 +33,92 @@ st.markdown("""
                 display: inline-block; margin-right: 0.4rem; font-size: 0.8rem; }
 .badge-cat { background: #1e88e5; color: white; padding: 0.2rem 0.6rem; border-radius: 4px;
              display: inline-block; margin-right: 0.4rem; font-size: 0.8rem; }
+.article-summary mark { background: #fff59d; padding: 0 0.1rem; }
 .divider { margin: 1rem 0; border-top: 1px solid #eee; }
 </style>
 """, unsafe_allow_html=True)
 
-# ── DB 초기화 ──────────────────────────────────────────────────────────────
-db.init_db()
+# 스키마는 첫 DB 조회 때 프로세스당 한 번 확인된다 (db.ensure_schema).
+# 크롤·AI 모듈(crawler, ai, google.generativeai ...)은 크롤 작업을 실행할 때 worker가 import한다.
+
+
+# ── 캐시: 조회 결과 ────────────────────────────────────────────────────────
+# 조회 결과는 db.data_version()을 인자로 받아 기사 데이터가 바뀌면 자동으로 새로 조회한다.
+# 안 읽은 기사 조회는 read_before(기준 시각) 이전 읽음 기록만 보므로 같은 기준 시각 안에서는
+# 읽음 처리가 결과를 바꾸지 않는다. 조회 기간 시작(since)은 UTC 자정 기준이라 하루 동안 같은 키가 된다.
+@st.cache_data(show_spinner=False)
+def cached_has_articles(version: int) -> bool:
+    return db.has_properly_categorized_articles()
+
+
+@st.cache_data(show_spinner=False)
+def cached_count_unread(version: int, api_key_hash: str, since: str,
+                        category, read_before: str) -> int:
+    return db.count_unread(api_key_hash, since, category, read_before=read_before)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_metrics_report(runs: int) -> Dict:
+    return metrics.build_report(runs)
+
+
+@st.cache_data(show_spinner=False)
+def cached_unread_page(version: int, api_key_hash: str, since: str, category,
+                       after, limit: int, read_before: str):
+    return db.get_unread_page(
+        api_key_hash, since, category, after=after, limit=limit, read_before=read_before,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_search(version: int, query: str, category, page: int, limit: int):
+    return db.search_articles(query, category=category, limit=limit, offset=page * limit)
+
+
+@st.cache_data(show_spinner=False)
+def cached_count_search(version: int, query: str, category) -> int:
+    return db.count_search(query, category=category)
+
+
+@st.cache_data(max_entries=200, show_spinner=False)
+def cached_article(version: int, article_id: int):
+    return db.get_article(article_id)
+
 
 # ── 세션 상태 기본값 ────────────────────────────────────────────────────────
 if "api_key" not in st.session_state:
     st.session_state.api_key = ""
 if "current_week" not in st.session_state:
+    # 최근 몇 주를 보여줄지 (0이면 최근 7일 + 오늘, crawl_coverage.week_window 기준)
     st.session_state.current_week = 0
 if "selected_category" not in st.session_state:
     st.session_state.selected_category = "전체"
 if "current_page" not in st.session_state:
     st.session_state.current_page = 0
-if "crawled_weeks" not in st.session_state:
-    st.session_state.crawled_weeks = set()
+if "page_cursors" not in st.session_state:
+    # page_cursors[p]: p 페이지 시작 직전 기사의 (published_at, id) 키 (0페이지는 None)
+    st.session_state.page_cursors = [None]
+if "search_page" not in st.session_state:
+    st.session_state.search_page = 0
+if "read_cutoff" not in st.session_state:
+    # 이 시각 이전에 읽은 기사만 숨김 (보는 중에 읽음 처리된 기사로 페이지가 밀리지 않도록)
+    st.session_state.read_cutoff = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+if "crawl_jobs" not in st.session_state:
+    # 이 세션이 등록한 진행 중 크롤 작업 id
+    st.session_state.crawl_jobs = []
+if "crawl_notices" not in st.session_state:
+    # 끝난 크롤 작업 결과 메시지 (다음 렌더링에서 한 번 표시)
+    st.session_state.crawl_notices = []
+
+
+def reset_feed_view():
+    """필터·주차가 바뀌면 첫 페이지부터, 지금까지 읽은 기사는 숨긴 상태로 다시 시작"""
+    st.session_state.current_page = 0
+    st.session_state.page_cursors = [None]
+    st.session_state.search_page = 0
+    # 버퍼에 남은 읽음 기록을 먼저 저장해야 새 기준 시각 이전 기록으로 숨겨짐
+    get_tracker().flush()
+    st.session_state.read_cutoff = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
 
 # ── 사이드바 ────────────────────────────────────────────────────────────────
@@ -78,15 +149,37 @@ with st.sidebar:
         db.clear_articles()
         st.session_state.current_week = 0
         st.session_state.selected_category = "전체"
-        st.session_state.current_page = 0
-        st.session_state.crawled_weeks = set()
+        reset_feed_view()
         st.rerun()
+    show_metrics = st.toggle("📊 크롤 성능 (관리자)")
+
+
+def metrics_panel(runs: int = 20):
+    """최근 크롤 실행의 단계별·피드별 p50/p95 (metrics.py 보고서와 같은 내용)"""
+    report = cached_metrics_report(runs)
+    if not report["runs"]:
+        st.info("기록된 크롤 실행이 없습니다.")
+        return
+    ai = report["ai"]
+    col_runs, col_calls, col_tokens, col_errors = st.columns(4)
+    col_runs.metric("최근 실행", len(report["runs"]))
+    col_calls.metric("AI 요청 (재시도)", f"{ai['ai_calls']} ({ai['ai_retries']})")
+    col_tokens.metric("토큰 입력/출력", f"{ai['prompt_tokens']:,} / {ai['output_tokens']:,}")
+    col_errors.metric("피드 오류", sum(run["feed_errors"] or 0 for run in report["runs"]))
+    st.markdown("**단계별 소요 시간 (초)**")
+    st.dataframe(report["stages"], use_container_width=True, hide_index=True)
+    st.markdown("**피드별 전체 시간 (초, p95 느린 순)**")
+    st.dataframe(report["feeds"], use_container_width=True, hide_index=True)
 
 
 # ── 메인 헤더 ────────────────────────────────────────────────────────────────
 st.title("📱 Samsung Electronics Europe IPC")
 st.markdown("유럽 기술 뉴스 - AI 기반 분류")
 
+if show_metrics:
+    metrics_panel()
+    st.divider()
+
 api_key = st.session_state.api_key
 if not api_key:
     st.warning("API 키를 사이드바에 입력하세요")
@@ -96,55 +189,79 @@ if not api_key:
 api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
 
 
-# ── 유틸: 중복 제거 ──────────────────────────────────────────────────────────
-def deduplicate(new_articles: List[Dict], existing_articles: List[Dict]) -> List[Dict]:
-    final = []
-    all_existing = list(existing_articles)
-    for article in new_articles:
-        is_dup = False
-        for other in all_existing:
-            if _jaccard_similarity(
-                f"{article.get('title','')} {article.get('content','')}",
-                f"{other.get('title','')} {other.get('content','')}",
-            ) >= 0.5:
-                is_dup = True
-                break
-        if not is_dup:
-            final.append(article)
-            all_existing.append(article)
-    return final
-
-
-# ── 크롤 함수 ────────────────────────────────────────────────────────────────
+# ── 크롤: 백그라운드 워커에 작업 등록 ─────────────────────────────────────────
 def run_crawl(week_offset: int):
-    now = datetime.now(timezone.utc)
-    until_date = now - timedelta(days=7 * week_offset)
-    since_date = now - timedelta(days=7 * (week_offset + 1))
-
-    with st.spinner(f"⏳ 기사 크롤링 중... (최근 {week_offset + 1}주차)"): 
-        articles = crawler.crawl_all(WEBSITES, since_date, until_date)
-
-    st.info(f"📰 {len(articles)}개 기사 수집됨")
-
-    if not articles:
-        st.warning("수집된 기사가 없습니다.")
-        st.session_state.crawled_weeks.add(week_offset)
+    """week_offset 주차 크롤 작업을 백그라운드 워커에 등록 (화면은 진행 상황만 표시)"""
+    job_id = get_worker().submit(week_offset, api_key)
+    if job_id is None:
+        st.error("❌ 크롤 작업을 등록하지 못했습니다.")
         return
+    if job_id not in st.session_state.crawl_jobs:
+        st.session_state.crawl_jobs.append(job_id)
+
+
+def _job_notice(job: Dict) -> tuple:
+    """끝난 작업 결과 메시지 (종류, 문구)"""
+    if job["status"] == "failed":
+        return "error", f"❌ {job['week_offset'] + 1}주차 크롤 실패: {job['error']}"
+    text = (
+        f"✅ {job['week_offset'] + 1}주차: {job['articles_found']}개 기사 수집, "
+        f"{job['articles_stored']}개 유럽 관련 기사 저장됨"
+    )
+    if job["ai_failed"]:
+        text += f" (⚠️ {job['ai_failed']}개는 AI 분류에 실패해 다음 크롤에서 다시 시도합니다)"
+    return "success", text
+
+
+@st.fragment(run_every=2)
+def crawl_progress(rendered_version: int):
+    """진행 중인 크롤 작업 표시 - 새 기사가 저장되거나 작업이 끝나면 페이지 전체를 다시 그림"""
+    active = False
+    for job_id in list(st.session_state.crawl_jobs):
+        job = db.get_crawl_job(job_id)
+        if job is None:
+            st.session_state.crawl_jobs.remove(job_id)
+            continue
+        if job["status"] not in db.ACTIVE_JOB_STATUSES:
+            st.session_state.crawl_jobs.remove(job_id)
+            st.session_state.crawl_notices.append(_job_notice(job))
+            continue
+        active = True
+        week = job["week_offset"] + 1
+        if job["status"] == "queued":
+            st.progress(0.0, text=f"⏳ {week}주차 크롤 대기 중...")
+            continue
+        feeds = job["feeds_done"] / job["feeds_total"] if job["feeds_total"] else 0.0
+        classified = (
+            job["articles_classified"] / job["classify_total"] if job["classify_total"] else 0.0
+        )
+        st.progress(
+            min(1.0, 0.3 * feeds + 0.7 * classified),
+            text=(
+                f"⏳ {week}주차 · 📡 피드 {job['feeds_done']}/{job['feeds_total']} · "
+                f"🤖 분류 {job['articles_classified']}/{job['classify_total']} · "
+                f"💾 저장 {job['articles_stored']}"
+            ),
+        )
+    if not active or db.data_version() != rendered_version:
+        st.rerun()
 
-    with st.spinner("🤖 AI 분류 중... (수 분 소요될 수 있습니다)"): 
-        ai = AIProcessor(api_key)
-        processed = ai.process_articles_parallel(articles, max_workers=5)
 
-    europe_articles = [a for a in processed if a.get("is_europe_relevant")]
-    existing = db.get_articles(week_offset)
-    final = deduplicate(europe_articles, existing)
-    db.insert_articles(final, week_offset)
-    st.session_state.crawled_weeks.add(week_offset)
-    st.success(f"✅ {len(final)}개 유럽 관련 기사 저장됨")
+# ── 크롤 진행 상황 ───────────────────────────────────────────────────────────
+data_version = db.data_version()
+for kind, text in st.session_state.crawl_notices:
+    getattr(st, kind)(text)
+st.session_state.crawl_notices = []
+if st.session_state.crawl_jobs:
+    crawl_progress(data_version)
 
 
-# ── 최초 실행: DB에 기사가 없으면 버튼으로 크롤 시작 ──────────────────────────
-if not db.has_properly_categorized_articles() and 0 not in st.session_state.crawled_weeks:
+# ── 최초 실행: DB에 기사도 수집 기록도 없으면 버튼으로 크롤 시작 ────────────────
+if (
+    not cached_has_articles(data_version)
+    and not st.session_state.crawl_jobs
+    and not db.get_coverage()
+):
     st.info("📭 아직 수집된 기사가 없습니다. 아래 버튼을 눌러 최근 1주일 기사를 불러오세요.")
     if st.button("🚀 기사 불러오기 (최근 1주일)", type="primary", use_container_width=True):
         run_crawl(0)
@@ -154,13 +271,17 @@ if not db.has_properly_categorized_articles() and 0 not in st.session_state.craw
 
 # ── 기사 로드 및 필터 ────────────────────────────────────────────────────────
 max_week = st.session_state.current_week
-all_articles: List[Dict] = []
-for w in range(max_week + 1):
-    all_articles.extend(db.get_articles(w))
+view_since = crawl_coverage.week_window(max_week)[0].isoformat()
+selected = st.session_state.selected_category
+category_filter = None if selected == "전체" else selected
 
-# 읽은 기사 제외
-read_links = db.get_read_links(api_key_hash)
-all_articles = [a for a in all_articles if a["link"] not in read_links]
+# 전체 기간 전문 검색 (검색어가 있으면 피드 대신 검색 결과를 보여줌)
+search_query = st.text_input(
+    "🔎 기사 검색",
+    key="search_query",
+    placeholder="예: Infineon SiC, ASML (저장된 전체 기간의 제목·요약·본문·기업명)",
+    on_change=lambda: st.session_state.update(search_page=0),
+).strip()
 
 # 카테고리 필터 버튼
 col_buttons = st.columns([1] + [2] * len(CATEGORIES))
@@ -168,7 +289,7 @@ with col_buttons[0]:
     if st.button("전체", use_container_width=True,
                  type="primary" if st.session_state.selected_category == "전체" else "secondary"):
         st.session_state.selected_category = "전체"
-        st.session_state.current_page = 0
+        reset_feed_view()
         st.rerun()
 
 for i, cat in enumerate(CATEGORIES):
@@ -176,52 +297,103 @@ for i, cat in enumerate(CATEGORIES):
         btn_type = "primary" if st.session_state.selected_category == cat else "secondary"
         if st.button(cat, use_container_width=True, type=btn_type):
             st.session_state.selected_category = cat
-            st.session_state.current_page = 0
+            reset_feed_view()
             st.rerun()
 
-# 카테고리 필터 적용
-selected = st.session_state.selected_category
-if selected != "전체":
-    filtered_articles = [a for a in all_articles if selected in a.get("categories", [])]
-else:
-    filtered_articles = all_articles
 
-# ── 페이지네이션 ─────────────────────────────────────────────────────────────
+def safe_href(url: str) -> str:
+    """피드에서 온 링크를 href 속성에 넣을 수 있게 escape (http/https 외 스킴은 막음)"""
+    if not url.lower().startswith(("http://", "https://")):
+        return "#"
+    return html.escape(url, quote=True)
+
+
+def render_article(article: db.ArticleRow):
+    """목록 한 줄 - 요약·본문은 펼칠 때만 DB에서 조회 (피드·AI에서 온 값은 모두 escape)"""
+    st.markdown(
+        f"<div class='article-title'><a href='{safe_href(article.link)}' target='_blank'>"
+        f"{html.escape(article.title)}</a></div>",
+        unsafe_allow_html=True,
+    )
+    if article.snippet:
+        # snippet은 db에서 escape 후 <mark>만 넣은 HTML
+        st.markdown(f"<div class='article-summary'>{article.snippet}</div>", unsafe_allow_html=True)
+
+    meta = f"<span class='badge-source'>📰 {html.escape(article.source or '')}</span>"
+    for alt in article.alt_links:
+        meta += (
+            f"<span class='badge-source'><a href='{safe_href(alt.get('link') or '')}' target='_blank'>"
+            f"📰 {html.escape(alt.get('source') or '')}</a></span>"
+        )
+    for cat in article.categories:
+        meta += f"<span class='badge-cat'>📁 {html.escape(cat)}</span>"
+    pub = (article.published_at or "")[:10]
+    if pub:
+        meta += f"<span style='color:#888;font-size:0.8rem;margin-left:0.5rem'>{html.escape(pub)}</span>"
+    st.markdown(meta, unsafe_allow_html=True)
+
+    if st.toggle("📄 요약·본문", key=f"detail_{article.id}"):
+        detail = cached_article(data_version, article.id)
+        if detail is None:
+            st.caption("기사를 찾을 수 없습니다.")
+        else:
+            if detail["summary"]:
+                st.markdown(
+                    f"<div class='article-summary'>{html.escape(detail['summary'])}</div>",
+                    unsafe_allow_html=True,
+                )
+            if detail["content"]:
+                st.caption(detail["content"])
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+
+
 PAGE_SIZE = 10
-total = len(filtered_articles)
+
+# ── 검색 결과 (FTS 인덱스에서 관련도순으로 한 페이지씩 조회) ────────────────────
+if search_query:
+    search_page = st.session_state.search_page
+    found = cached_count_search(data_version, search_query, category_filter)
+    results, has_more = cached_search(data_version, search_query, category_filter, search_page, PAGE_SIZE)
+    st.markdown(
+        f"**'{search_query}' 검색 결과 {found}개** · 페이지 {search_page + 1}/"
+        f"{max(1, (found + PAGE_SIZE - 1) // PAGE_SIZE)}"
+    )
+    if not results:
+        st.info("🔎 일치하는 기사가 없습니다.")
+    for article in results:
+        render_article(article)
+
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        if search_page > 0 and st.button("⬅️ 이전", key="search_prev"):
+            st.session_state.search_page = search_page - 1
+            st.rerun()
+    with col_next:
+        if has_more and st.button("다음 ➡️", key="search_next"):
+            st.session_state.search_page = search_page + 1
+            st.rerun()
+    st.stop()
+
+# ── 페이지네이션 (안 읽은 기사만 SQL에서 한 페이지씩 조회) ─────────────────────
+current_page = min(st.session_state.current_page, len(st.session_state.page_cursors) - 1)
+read_cutoff = st.session_state.read_cutoff
+total = cached_count_unread(data_version, api_key_hash, view_since, category_filter, read_cutoff)
+page_articles, has_next = cached_unread_page(
+    data_version, api_key_hash, view_since, category_filter,
+    st.session_state.page_cursors[current_page], PAGE_SIZE, read_cutoff,
+)
 total_pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
-current_page = min(st.session_state.current_page, total_pages - 1)
 
 st.markdown(f"**총 {total}개 기사** · 페이지 {current_page + 1}/{total_pages}")
 
-start = current_page * PAGE_SIZE
-page_articles = filtered_articles[start: start + PAGE_SIZE]
-
 if not page_articles:
     st.info("📥 표시할 기사가 없습니다.")
 else:
     for article in page_articles:
-        link = article.get("link", "#")
-        title = article.get("title", "제목 없음")
-        source = article.get("source", "")
+        render_article(article)
 
-        st.markdown(
-            f"<div class='article-title'><a href='{link}' target='_blank'>{title}</a></div>",
-            unsafe_allow_html=True,
-        )
-
-        meta = f"<span class='badge-source'>📰 {source}</span>"
-        for cat in article.get("categories", []):
-            meta += f"<span class='badge-cat'>📁 {cat}</span>"
-        pub = article.get("published_at", "")[:10]
-        if pub:
-            meta += f"<span style='color:#888;font-size:0.8rem;margin-left:0.5rem'>{pub}</span>"
-        st.markdown(meta, unsafe_allow_html=True)
-
-        # 기사 읽음 처리
-        db.mark_read(api_key_hash, link)
-
-        st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+    # 페이지의 기사를 한 번에 읽음 처리 (백그라운드에서 한 트랜잭션으로 저장)
+    get_tracker().record(api_key_hash, [a.link for a in page_articles])
 
 # ── 페이지 이동 버튼 ──────────────────────────────────────────────────────────
 col_prev, col_next = st.columns(2)
@@ -229,23 +401,29 @@ with col_prev:
     if current_page > 0:
         if st.button("⬅️ 이전"):
             st.session_state.current_page = current_page - 1
+            st.session_state.page_cursors = st.session_state.page_cursors[:current_page]
             st.rerun()
 
 with col_next:
-    if current_page < total_pages - 1:
+    if has_next:
         if st.button("다음 ➡️"):
+            last = page_articles[-1]
+            st.session_state.page_cursors = st.session_state.page_cursors[:current_page + 1] + [
+                (last.published_at, last.id)
+            ]
             st.session_state.current_page = current_page + 1
             st.rerun()
 
 # ── 마지막 페이지에 "1주일 더 로딩" 버튼 ────────────────────────────────────
-is_last_page = current_page == total_pages - 1
-is_last_week = max_week == db.get_max_week_offset()
+is_last_page = not has_next
 
-if is_last_page and is_last_week:
+if is_last_page and not st.session_state.crawl_jobs:
     st.divider()
     if st.button("📅 1주일 더 로딩"):
         next_week = max_week + 1
         st.session_state.current_week = next_week
-        run_crawl(next_week)
-        st.session_state.current_page = 0
-        st.rerun()
\ No newline at end of file
+        # 이전 크롤·scheduler.py가 이미 수집한 기간이면 크롤 없이 DB에서 바로 표시
+        if not crawl_coverage.is_covered(WEBSITES, *crawl_coverage.week_window(next_week)):
+            run_crawl(next_week)
+        reset_feed_view()
+        st.rerun()
@@ -0,0 +1,78 @@
+"""
+가짜 Gemini - AIProcessor.model 대신 지연 시간·429를 흉내 내며 결정적인 분류 결과를 돌려줌
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+from google.api_core.exceptions import ResourceExhausted
+
+import ai
+from config import CATEGORIES
+
+_ARTICLE_HEADER = re.compile(r"^\[Article (\d+)\]$", re.MULTILINE)
+
+
+def _result(text: str) -> dict:
+    """기사 본문 해시로 정하는 분류 결과 (같은 기사는 항상 같은 결과)"""
+    digest = zlib.crc32(text.encode())
+    return {
+        "is_europe_relevant": digest % 3 != 0,
+        "categories": [CATEGORIES[digest % len(CATEGORIES)]],
+        "summary": "벤치마크 요약 " + text[:40].replace("\n", " "),
+        "companies": ["Infineon"] if digest % 2 else [],
+    }
+
+
+class FakeModel:
+    """genai.GenerativeModel.generate_content 대체
+
+    latency초 대기 후 응답하고, throttle_every번째 호출마다 429(ResourceExhausted)를 낸다 (0이면 없음).
+    배치 프롬프트([Article N] 블록)에는 JSON 배열, 단일 프롬프트에는 JSON 객체로 답한다.
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_every: int = 0):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.calls = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str):
+        with self._lock:
+            self.calls += 1
+            throttle = self.throttle_every and self.calls % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            raise ResourceExhausted("429 Resource has been exhausted (benchmark)")
+
+        headers = list(_ARTICLE_HEADER.finditer(prompt))
+        if headers:
+            blocks = [
+                prompt[m.end():headers[i + 1].start() if i + 1 < len(headers) else len(prompt)]
+                for i, m in enumerate(headers)
+            ]
+            text = json.dumps(
+                [{"index": int(m.group(1)), **_result(block)} for m, block in zip(headers, blocks)],
+                ensure_ascii=False,
+            )
+        else:
+            text = json.dumps(_result(prompt), ensure_ascii=False)
+        usage = SimpleNamespace(
+            prompt_token_count=ai._estimate_tokens(prompt),
+            candidates_token_count=ai._estimate_tokens(text),
+        )
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+def make_processor(latency: float = 0.0, throttle_every: int = 0, use_cache: bool = False) -> ai.AIProcessor:
+    """FakeModel을 쓰는 AIProcessor (API 키·네트워크 불필요)"""
+    processor = ai.AIProcessor("benchmark", use_cache=use_cache)
+    processor.model = FakeModel(latency, throttle_every)
+    return processor
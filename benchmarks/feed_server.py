@@ -0,0 +1,85 @@
+"""
+로컬 피드 서버 - 합성 RSS/Atom 피드를 지정한 지연 시간 뒤에 돌려주는 HTTP 서버 (실제 사이트 대신)
+"""
+import http.server
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from synthetic import feed_xml
+
+CONTENT_TYPES = {"rss": "application/rss+xml", "atom": "application/atom+xml"}
+
+
+def build_feeds(articles: List[Dict], feeds: int, fmt: str = "mixed") -> Dict[str, Tuple[bytes, str]]:
+    """기사를 feeds개 피드에 나눠 담은 {경로: (원문, Content-Type)}
+
+    fmt="mixed"이면 피드마다 RSS와 Atom을 번갈아 쓴다.
+    """
+    result = {}
+    for i in range(feeds):
+        feed_fmt = ("rss", "atom")[i % 2] if fmt == "mixed" else fmt
+        result[f"/feed/{i}"] = (
+            feed_xml(articles[i::feeds], f"Bench feed {i}", feed_fmt), CONTENT_TYPES[feed_fmt]
+        )
+    return result
+
+
+class FeedServer:
+    """with 블록 동안 백그라운드 스레드에서 도는 피드 서버
+
+        with FeedServer(build_feeds(articles, 20), latency=0.05) as server:
+            crawler.crawl_all(server.websites, since, until)
+    """
+
+    def __init__(self, feeds: Dict[str, Tuple[bytes, str]], latency: float = 0.0):
+        self.feeds = feeds
+        self.latency = latency
+        self.requests = 0
+        self._server = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                feed = server.feeds.get(self.path)
+                if feed is None:
+                    self.send_error(404)
+                    return
+                body, content_type = feed
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "FeedServer":
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def websites(self) -> List[Dict]:
+        """config.WEBSITES 형식의 사이트 목록"""
+        host, port = self._server.server_address
+        return [
+            {"name": f"Bench feed {path.rsplit('/', 1)[-1]}", "url": f"http://{host}:{port}/",
+             "rss": f"http://{host}:{port}{path}"}
+            for path in self.feeds
+        ]
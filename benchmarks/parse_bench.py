@@ -0,0 +1,103 @@
+"""
+피드 파싱 벤치마크 - 스레드 풀 vs 프로세스 풀 (crawler.PARSE_MODE)
+
+네트워크 없이 합성 RSS 원문을 만들어 crawler._parse_feed만 반복 실행한다.
+프로세스 풀은 코어 수만큼 빨라지므로 여러 코어가 있는 머신에서 실행해야 의미가 있다.
+
+    python benchmarks/parse_bench.py --feeds 24 --items 150 --repeat 3
+"""
+import argparse
+import email.utils
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# skip_known=False로 파싱하므로 DB 파일은 만들지 않음
+import crawler  # noqa: E402
+
+PARAGRAPH = (
+    "<p>Samsung &amp; partners announced a new <a href='https://example.com/x?a=1&amp;b=2'>"
+    "European fab</a> investment &#8211; the plant in Dresden will produce "
+    "<strong>2nm</strong> chips for automotive customers&#8217; ECUs.</p>"
+)
+
+
+def make_feed(index: int, items: int, now: datetime) -> dict:
+    """합성 RSS 원문 (_fetch_raw 반환 형식)"""
+    entries = []
+    for i in range(items):
+        published = email.utils.format_datetime(now - timedelta(hours=i))
+        body = (PARAGRAPH * (8 + i % 12)).replace("&", "&amp;").replace("<", "&lt;")
+        entries.append(
+            f"<item><title>Feed {index} story {i} &amp; more</title>"
+            f"<link>https://example.com/{index}/{i}</link><guid>{index}-{i}</guid>"
+            f"<pubDate>{published}</pubDate><description>{body}</description></item>"
+        )
+    content = (
+        "<?xml version='1.0' encoding='utf-8'?><rss version='2.0'><channel>"
+        f"<title>Feed {index}</title>{''.join(entries)}</channel></rss>"
+    ).encode()
+    return {
+        "status": 200,
+        "content": content,
+        "url": f"https://example.com/{index}/feed",
+        "content_type": "application/rss+xml",
+        "etag": None,
+        "last_modified": None,
+    }
+
+
+def run(executor, feeds, since, until, now) -> float:
+    started = time.perf_counter()
+    futures = [
+        executor.submit(
+            crawler._parse_feed, {"name": f"F{i}"}, raw, since, until, None, now, False
+        )
+        for i, raw in enumerate(feeds)
+    ]
+    articles = sum(len(f.result()["articles"]) for f in futures)
+    assert articles, "파싱된 기사가 없습니다"
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="피드 파싱 스레드/프로세스 비교")
+    parser.add_argument("--feeds", type=int, default=24)
+    parser.add_argument("--items", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    crawler.logger.disabled = True
+    now = datetime.now(timezone.utc)
+    since, until = now - timedelta(days=30), now + timedelta(minutes=1)
+    feeds = [make_feed(i, args.items, now) for i in range(args.feeds)]
+
+    results = {"thread": [], "process": []}
+    with ThreadPoolExecutor(max_workers=crawler.PARSE_WORKERS) as threads:
+        pool = crawler._get_process_pool()
+        run(pool, feeds[:crawler.PARSE_PROCESSES], since, until, now)  # 프로세스 기동 제외
+        for _ in range(args.repeat):
+            results["thread"].append(run(threads, feeds, since, until, now))
+            results["process"].append(run(pool, feeds, since, until, now))
+
+    best = {mode: min(times) for mode, times in results.items()}
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "thread_workers": crawler.PARSE_WORKERS,
+        "process_workers": crawler.PARSE_PROCESSES,
+        "feeds": args.feeds,
+        "feed_bytes": sum(len(raw["content"]) for raw in feeds),
+        "thread_s": round(best["thread"], 3),
+        "process_s": round(best["process"], 3),
+        "speedup": round(best["thread"] / best["process"], 2),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+오프라인 벤치마크 - 실제 사이트·Gemini API 없이 크롤/AI 분류/중복 제거/DB 경로의 시간·메모리 측정
+
+로컬 피드 서버(feed_server.py)와 가짜 Gemini(fake_gemini.py)를 쓰고, 합성 데이터는 시드로 고정해
+커밋 간 결과를 그대로 비교할 수 있다.
+
+    python benchmarks/run.py --out baseline.json                  # 1k/10k/100k 전체
+    python benchmarks/run.py --sizes 1000,10000 --cases dedup,db_write
+    python benchmarks/run.py --out after.json --compare baseline.json --fail-on-regression
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 속도 제한기는 가짜 모델에 맞춰 사실상 끈다 (ai import 전에 설정)
+os.environ.setdefault("GEMINI_RPM", "1000000")
+os.environ.setdefault("GEMINI_TPM", "1000000000")
+
+import crawler  # noqa: E402
+import db  # noqa: E402
+import dedup  # noqa: E402
+import fake_gemini  # noqa: E402
+import ratelimit  # noqa: E402
+from feed_server import FeedServer, build_feeds  # noqa: E402
+from pipeline import COMMIT_CHUNK  # noqa: E402
+from synthetic import make_articles  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# 이 크기까지만 repeat회 반복해 최솟값을 쓰고, 그보다 크면 한 번만 실행
+REPEAT_MAX_SIZE = 10000
+# 피드 하나에 담는 기사 수 (크롤 케이스)
+ARTICLES_PER_FEED = 250
+READ_PAGES = 50
+BENCH_KEY_HASH = "benchmark"
+# DB 파일을 만드는 임시 디렉터리 (main에서 정하고 끝나면 삭제)
+WORKDIR = ""
+
+Setup = Callable[[List[Dict], argparse.Namespace, contextlib.ExitStack], Callable[[], int]]
+
+
+def _fresh_db(name: str):
+    """케이스 실행마다 빈 DB 파일로 전환 (db._connect가 경로 변경을 보고 다시 연결)
+
+    100k 크기에서는 DB 하나가 수백 MB이므로 이전 케이스의 DB 파일은 바로 지운다.
+    """
+    previous = db.DB_FILE
+    db.DB_FILE = os.path.join(WORKDIR, f"{name}_{time.perf_counter_ns()}.db")
+    db.init_db()
+    if os.path.dirname(previous) != WORKDIR:
+        return
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(previous + suffix)
+
+
+def _copies(articles: List[Dict]) -> List[Dict]:
+    """케이스가 기사 dict를 고치므로 (minhash, 분류 결과) 반복마다 새 사본 사용"""
+    return [dict(article) for article in articles]
+
+
+def _fresh_processor(args):
+    ratelimit._limiters.clear()
+    return fake_gemini.make_processor(args.ai_latency, args.throttle_every)
+
+
+def setup_crawl(articles, args, stack):
+    _fresh_db("crawl")
+    feeds = max(1, len(articles) // ARTICLES_PER_FEED)
+    server = stack.enter_context(FeedServer(build_feeds(articles, feeds), args.feed_latency))
+    now = datetime.now(timezone.utc)
+    since, until = now - timedelta(days=8), now + timedelta(minutes=1)
+
+    def run():
+        found = crawler.crawl_all(server.websites, since, until, use_cache=False, engine=args.engine)
+        return len(found)
+    return run
+
+
+def setup_ai_parallel(articles, args, stack):
+    processor, batch = _fresh_processor(args), _copies(articles)
+    return lambda: len(processor.process_articles_parallel(batch))
+
+
+def setup_ai_batched(articles, args, stack):
+    processor, batch = _fresh_processor(args), _copies(articles)
+    return lambda: len(processor.process_articles_batched(batch))
+
+
+def setup_dedup(articles, args, stack):
+    batch = _copies(articles)
+    return lambda: len(dedup.deduplicate(batch, []))
+
+
+def setup_db_write(articles, args, stack):
+    _fresh_db("write")
+
+    def run():
+        stored = 0
+        for start in range(0, len(articles), COMMIT_CHUNK):
+            stored += db.insert_articles(articles[start:start + COMMIT_CHUNK])["inserted"]
+        return stored
+    return run
+
+
+def setup_db_read(articles, args, stack):
+    _fresh_db("read")
+    for start in range(0, len(articles), COMMIT_CHUNK * 25):
+        db.insert_articles(articles[start:start + COMMIT_CHUNK * 25])
+    since = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
+
+    def run():
+        items = len(db.get_articles(since))
+        items += db.count_unread(BENCH_KEY_HASH, since)
+        after, more = None, True
+        for _ in range(READ_PAGES):
+            if not more:
+                break
+            page, more = db.get_unread_page(BENCH_KEY_HASH, since, after=after)
+            items += len(page)
+            after = (page[-1].published_at, page[-1].id) if page else None
+        return items
+    return run
+
+
+def setup_db_list(articles, args, stack):
+    """목록 화면용 ArticleRow 조회 (get_articles와 같은 조건, 본문 제외)"""
+    _fresh_db("list")
+    for start in range(0, len(articles), COMMIT_CHUNK * 25):
+        db.insert_articles(articles[start:start + COMMIT_CHUNK * 25])
+    since = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
+    return lambda: len(db.get_article_list(since))
+
+
+CASES: Dict[str, Setup] = {
+    "crawl": setup_crawl,
+    "ai_parallel": setup_ai_parallel,
+    "ai_batched": setup_ai_batched,
+    "dedup": setup_dedup,
+    "db_write": setup_db_write,
+    "db_read": setup_db_read,
+    "db_list": setup_db_list,
+}
+
+
+def measure(setup: Setup, articles: List[Dict], args, repeat: int) -> Dict:
+    """준비 단계를 뺀 실행 시간 최솟값, 그리고 (별도 1회 실행의) tracemalloc 최대 메모리"""
+    best, items = None, 0
+    for _ in range(repeat):
+        random.seed(args.seed)
+        with contextlib.ExitStack() as stack:
+            run = setup(articles, args, stack)
+            started = time.perf_counter()
+            items = run()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak_mb = None
+    if args.memory:
+        random.seed(args.seed)
+        with contextlib.ExitStack() as stack:
+            run = setup(articles, args, stack)
+            tracemalloc.start()
+            try:
+                run()
+                peak_mb = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            finally:
+                tracemalloc.stop()
+    return {
+        "seconds": round(best, 4),
+        "per_item_ms": round(best * 1000 / max(len(articles), 1), 4),
+        "peak_mb": peak_mb,
+        "items": items,
+    }
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """기준 결과 대비 배율 출력, threshold배 이상 느려지거나 메모리가 늘어난 항목 목록 반환"""
+    base = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n기준: {baseline['meta'].get('git')} ({baseline['meta'].get('timestamp')})")
+    for result in results:
+        before = base.get((result["case"], result["size"]))
+        if not before:
+            continue
+        label = f"{result['case']}@{result['size']}"
+        ratios = {"time": result["seconds"] / max(before["seconds"], 1e-9)}
+        if result["peak_mb"] and before.get("peak_mb"):
+            ratios["memory"] = result["peak_mb"] / before["peak_mb"]
+        flagged = [kind for kind, ratio in ratios.items() if ratio >= threshold]
+        marks = "  ".join(f"{kind} x{ratio:.2f}" for kind, ratio in ratios.items())
+        print(f"{'🐢' if flagged else '  '} {label:<22} {marks}")
+        regressions += [f"{label} {kind}" for kind in flagged]
+    return regressions
+
+
+def _run_cases(args, sizes: List[int], cases: List[str], workdir: str) -> List[Dict]:
+    """크기별로 케이스 측정 (DB 파일은 모두 workdir에 만듦)"""
+    global WORKDIR
+    WORKDIR = workdir
+    db.DB_FILE = os.path.join(workdir, "bench.db")
+    results = []
+    for size in sizes:
+        articles = make_articles(size, seed=args.seed, dup_rate=args.dup_rate)
+        repeat = args.repeat if size <= REPEAT_MAX_SIZE else 1
+        for case in cases:
+            result = {"case": case, "size": size, **measure(CASES[case], articles, args, repeat)}
+            results.append(result)
+            print(
+                f"📊 {case:<12} {size:>7}  {result['seconds']:>9.3f}s  "
+                f"{result['per_item_ms']:>8.4f}ms/건  peak {result['peak_mb']}MB  ({result['items']}건)",
+                flush=True,
+            )
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="크롤/AI/중복 제거/DB 오프라인 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="기사 수 (쉼표 구분)")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"실행할 케이스 ({', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help=f"{REPEAT_MAX_SIZE}개 이하에서 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="근접 중복 기사 비율")
+    parser.add_argument("--feed-latency", type=float, default=0.0, help="피드 서버 응답 지연 (초)")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="가짜 Gemini 응답 지연 (초)")
+    parser.add_argument("--throttle-every", type=int, default=0, help="N번째 AI 호출마다 429 (0이면 없음)")
+    parser.add_argument("--engine", default=crawler.CRAWL_ENGINE, choices=("thread", "async"))
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="tracemalloc 측정 생략")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 볼 배율 (기본 1.2)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"알 수 없는 케이스: {', '.join(unknown)}")
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        results = _run_cases(args, sizes, cases, workdir)
+    report = {
+        "meta": {
+            "git": _git_sha(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n🐢 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
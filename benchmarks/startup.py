@@ -0,0 +1,152 @@
+"""
+앱 시작 시간 점검 - app.py가 import하는 모듈의 로딩 시간과 Streamlit 첫 실행·재실행 시간
+
+app.py 최상위 import를 새 인터프리터에서 그대로 실행해 시간을 재고, 크롤·AI 전용 무거운 모듈
+(HEAVY_MODULES)이 딸려 들어오면 실패로 본다. 재실행 시간은 streamlit.testing의 AppTest로
+임시 DB에서 측정한다.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --max-import-ms 400 --max-rerun-ms 300 --json
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+# 기사를 보기만 하는 세션에서는 로딩되면 안 되는 모듈 (크롤 작업을 시작할 때 worker가 import)
+HEAVY_MODULES = (
+    "crawler", "ai", "pipeline", "feedparser", "bs4", "aiohttp", "requests", "google.generativeai",
+)
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import streamlit
+streamlit_s = time.perf_counter() - started
+started = time.perf_counter()
+{imports}
+app_s = time.perf_counter() - started
+print(json.dumps({{
+    "streamlit_ms": round(streamlit_s * 1000, 1),
+    "app_imports_ms": round(app_s * 1000, 1),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def app_imports() -> List[str]:
+    """app.py 최상위 import 문 (streamlit 제외)"""
+    with open(APP, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    imports = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [alias.name for alias in node.names]
+            module = node.module if isinstance(node, ast.ImportFrom) else names[0]
+            if module != "streamlit":
+                imports.append(ast.unparse(node))
+    return imports
+
+
+def _slowest_imports(stderr: str, top: int) -> List[Dict]:
+    """-X importtime 출력에서 누적 시간이 큰 최상위 모듈"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 들여쓰기가 없는 줄이 최상위 import
+        if not name[1:].startswith(" "):
+            rows.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+    return sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top]
+
+
+def measure_imports(workdir: str, top: int = 10) -> Dict:
+    """새 인터프리터에서 app.py import 구간 측정 (디스크 캐시가 데워진 뒤의 값이므로 두 번째 실행 사용)"""
+    code = _PROBE.format(root=ROOT, imports="\n".join(app_imports()), heavy=HEAVY_MODULES)
+    for _ in range(2):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=workdir, capture_output=True, text=True, check=True,
+        )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["slowest"] = _slowest_imports(proc.stderr, top)
+    return result
+
+
+def measure_reruns(workdir: str, reruns: int) -> Dict:
+    """AppTest로 첫 실행과 재실행 시간 측정 (workdir의 빈 임시 DB, API 키는 환경 변수로)"""
+    from streamlit.testing.v1 import AppTest
+
+    os.environ.setdefault("GEMINI_API_KEY", "startup-check")
+    sys.path.insert(0, ROOT)
+    # AppTest는 앱을 이 프로세스에서 실행하므로 같은 db 모듈을 임시 DB로 돌려 둔다
+    import db
+
+    db.DB_FILE = os.path.join(workdir, "startup.db")
+
+    app = AppTest.from_file(APP, default_timeout=60)
+    started = time.perf_counter()
+    app.run()
+    first_s = time.perf_counter() - started
+    times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - started)
+    return {
+        "first_run_ms": round(first_s * 1000, 1),
+        "rerun_ms": round(min(times) * 1000, 1) if times else None,
+        "errors": [e.value for e in app.exception],
+        "heavy_after_run": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="앱 import·재실행 시간 점검")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="app.py import 시간 상한 (streamlit 제외)")
+    parser.add_argument("--max-rerun-ms", type=float, default=None, help="재실행 시간 상한")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="startup_") as workdir:
+        report = {**measure_imports(workdir), **measure_reruns(workdir, args.reruns)}
+
+    problems = []
+    heavy = sorted(set(report["heavy"]) | set(report["heavy_after_run"]))
+    if heavy:
+        problems.append(f"무거운 모듈이 로딩됨: {', '.join(heavy)}")
+    if report["errors"]:
+        problems.append(f"앱 실행 오류: {report['errors'][0]}")
+    if args.max_import_ms is not None and report["app_imports_ms"] > args.max_import_ms:
+        problems.append(f"import {report['app_imports_ms']}ms > {args.max_import_ms}ms")
+    if args.max_rerun_ms is not None and (report["rerun_ms"] or 0) > args.max_rerun_ms:
+        problems.append(f"재실행 {report['rerun_ms']}ms > {args.max_rerun_ms}ms")
+    report["problems"] = problems
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"📊 streamlit {report['streamlit_ms']}ms · app import {report['app_imports_ms']}ms · "
+            f"첫 실행 {report['first_run_ms']}ms · 재실행 {report['rerun_ms']}ms"
+        )
+        for row in report["slowest"]:
+            print(f"   {row['module']:<24} {row['cumulative_ms']:>8.1f}ms")
+        for problem in problems:
+            print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+HTML 태그 제거 동등성 검사 - crawler._strip_html이 BeautifulSoup get_text와 같은 결과를 내는지 확인
+
+strip_html_corpus.json(엔티티·주석·CDATA·깨진 마크업 등 경계 사례)과 시드로 만든 무작위 조각을
+limit None/2000/50 각각에 대해 BeautifulSoup(html, "html.parser").get_text(" ", strip=True)와 비교한다.
+하나라도 다르면 종료 코드 1.
+
+    python benchmarks/strip_html_check.py
+    python benchmarks/strip_html_check.py --random 90000 --seed 1
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import warnings
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import crawler  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strip_html_corpus.json")
+LIMITS = (None, 2000, 50)
+
+# 무작위 조각 재료 - 태그·참조·주석 경계를 섞어 토크나이저의 여러 경로를 지나가게 함
+_PARTS = [
+    "<p>", "</p>", "<b>", "</b>", "<br/>", "<br>", "<div class='x'>", "</div>", "<a href='?a=1&amp;b=2'>",
+    "</a>", "<script>", "</script>", "<style>", "</style>", "<!-- c -->", "<!--", "-->", "<![CDATA[", "]]>",
+    "<!DOCTYPE html>", "<?pi?>", "&amp;", "&lt;", "&nbsp;", "&copy", "&bogus;", "&#8217;", "&#x41;",
+    "&#128;", "&#;", "&", "<", ">", " ", "  ", "\n", "\t", "text", "Samsung", "삼성전자", "ü", "“q”", "🚀",
+    "<img src=x onerror=y>", "<p\nclass='m'>", "</>", "<<", "=", "'", '"',
+]
+
+
+def random_fragment(rng: random.Random) -> str:
+    return "".join(rng.choice(_PARTS) for _ in range(rng.randint(1, 40)))
+
+
+def expected(html: str, limit: Optional[int]) -> str:
+    if not html:
+        return ""
+    return BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)[:limit]
+
+
+def check(fragments: List[str]) -> List[dict]:
+    """다른 결과 목록 [{"html", "limit", "expected", "actual"}, ...]"""
+    mismatches = []
+    for html in fragments:
+        for limit in LIMITS:
+            want, got = expected(html, limit), crawler._strip_html(html, limit)
+            if want != got:
+                mismatches.append({"html": html, "limit": limit, "expected": want, "actual": got})
+    return mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="_strip_html ↔ BeautifulSoup get_text 동등성 검사")
+    parser.add_argument("--random", type=int, default=2000, help="추가로 검사할 무작위 조각 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show", type=int, default=5, help="출력할 불일치 사례 수")
+    args = parser.parse_args(argv)
+    # 조각이 XML·URL처럼 보일 때 bs4가 내는 경고 (결과에는 영향 없음)
+    warnings.simplefilter("ignore")
+
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = json.load(f)
+    rng = random.Random(args.seed)
+    fragments = corpus + [random_fragment(rng) for _ in range(args.random)]
+
+    mismatches = check(fragments)
+    print(
+        f"📊 코퍼스 {len(corpus)}개 + 무작위 {args.random}개 × limit {list(LIMITS)} → "
+        f"불일치 {len(mismatches)}건"
+    )
+    for case in mismatches[:args.show]:
+        print(json.dumps({k: v[:200] if isinstance(v, str) else v for k, v in case.items()}, ensure_ascii=False))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+벤치마크용 합성 데이터 - 기사 dict와 RSS/Atom 피드 원문 (시드가 같으면 실행마다 같은 데이터)
+"""
+import email.utils
+import random
+from datetime import datetime, timedelta, timezone
+from html import escape
+from typing import Dict, List, Optional
+
+from config import CATEGORIES
+
+_SYLLABLES = ["ka", "ri", "to", "sem", "con", "duc", "tor", "fab", "wa", "fer", "nit", "ride",
+              "lum", "cell", "bat", "ter", "ion", "net", "ro", "bot", "chip", "volt", "eu", "ra"]
+SOURCES = [f"Bench Source {i}" for i in range(20)]
+COMPANIES = ["Infineon", "ASML", "STMicroelectronics", "NXP", "Nokia", "Ericsson", "Siemens",
+             "Bosch", "Northvolt", "Soitec", "Aixtron", "Nordic Semiconductor"]
+
+
+def _vocabulary(size: int = 3000, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+VOCABULARY = _vocabulary()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def make_articles(
+    n: int,
+    seed: int = 0,
+    dup_rate: float = 0.1,
+    now: Optional[datetime] = None,
+    days: int = 7,
+) -> List[Dict]:
+    """크롤러가 만드는 것과 같은 형식의 기사 n개 (분류 결과 필드 포함)
+
+    dup_rate 비율만큼은 앞선 기사의 본문을 거의 그대로 쓴 근접 중복(다른 출처 재게재)이다.
+    published_at은 now 기준 최근 days일 안에 고르게 퍼진다.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    articles: List[Dict] = []
+    for i in range(n):
+        if articles and rng.random() < dup_rate:
+            original = rng.choice(articles)
+            words = original["content"].split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            title, content = original["title"], " ".join(words)
+        else:
+            title = _sentence(rng, rng.randint(6, 12))[:-1]
+            content = " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(4, 8)))
+        published = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        articles.append({
+            "title": title,
+            "link": f"https://bench.example/{seed}/{i}",
+            "source": SOURCES[i % len(SOURCES)],
+            "content": content[:2000],
+            "summary": content[:200],
+            "companies": rng.sample(COMPANIES, rng.randint(0, 2)),
+            "categories": rng.sample(CATEGORIES, rng.randint(1, 2)),
+            "is_europe_relevant": True,
+            "published_at": published.isoformat(),
+            "crawled_at": now.isoformat(),
+        })
+    return articles
+
+
+def feed_xml(articles: List[Dict], title: str, fmt: str = "rss") -> bytes:
+    """기사 목록을 RSS 2.0 또는 Atom 원문으로 (본문은 실제 피드처럼 HTML을 escape해 넣음)"""
+    entries = []
+    for article in articles:
+        published = datetime.fromisoformat(article["published_at"])
+        body = escape(f"<p>{article['content']}</p><p><a href='{article['link']}'>더 보기</a></p>")
+        if fmt == "atom":
+            entries.append(
+                f"<entry><title>{escape(article['title'])}</title>"
+                f"<link href='{article['link']}'/><id>{article['link']}</id>"
+                f"<updated>{published.isoformat()}</updated>"
+                f"<summary type='html'>{body}</summary></entry>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{escape(article['title'])}</title>"
+                f"<link>{article['link']}</link><guid>{article['link']}</guid>"
+                f"<pubDate>{email.utils.format_datetime(published)}</pubDate>"
+                f"<description>{body}</description></item>"
+            )
+    if fmt == "atom":
+        return (
+            "<?xml version='1.0' encoding='utf-8'?><feed xmlns='http://www.w3.org/2005/Atom'>"
+            f"<title>{escape(title)}</title>{''.join(entries)}</feed>"
+        ).encode()
+    return (
+        "<?xml version='1.0' encoding='utf-8'?><rss version='2.0'><channel>"
+        f"<title>{escape(title)}</title>{''.join(entries)}</channel></rss>"
+    ).encode()
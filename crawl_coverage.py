@@ -0,0 +1,70 @@
+"""
+수집 구간(coverage) - 피드별로 수집·AI 분류까지 마친 published_at 구간 (절대 시각, UTC)
+
+크롤은 요청 구간에서 이미 덮인 부분을 빼고 남은 구간만 수집·분류하고,
+끝까지 처리한 피드의 구간만 crawl_coverage에 기록한다.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import db
+
+Interval = Tuple[datetime, datetime]
+
+
+def week_window(week_offset: int, now: Optional[datetime] = None) -> Interval:
+    """week_offset 주차의 (since, until) - UTC 자정 기준 7일 단위, 0이면 최근 7일 + 오늘
+
+    경계가 자정에 맞춰져 있어 같은 날 다시 계산해도 구간이 같고 이전 크롤 구간과 그대로 이어진다.
+    """
+    now = now or datetime.now(timezone.utc)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    since = midnight - timedelta(days=7 * (week_offset + 1))
+    until = now if week_offset == 0 else midnight - timedelta(days=7 * week_offset)
+    return since, until
+
+
+def gaps(covered: List[Interval], since: datetime, until: datetime) -> List[Interval]:
+    """[since, until)에서 covered(시간순, 겹치지 않음)가 덮지 않은 구간 목록"""
+    result = []
+    cursor = since
+    for start, end in covered:
+        if end <= cursor:
+            continue
+        if start >= until:
+            break
+        if start > cursor:
+            result.append((cursor, start))
+        cursor = max(cursor, end)
+        if cursor >= until:
+            return result
+    if cursor < until:
+        result.append((cursor, until))
+    return result
+
+
+def load() -> Dict[str, List[Interval]]:
+    """rss별 수집 완료 구간"""
+    return {
+        rss: [(datetime.fromisoformat(s), datetime.fromisoformat(u)) for s, u in spans]
+        for rss, spans in db.get_coverage().items()
+    }
+
+
+def plan(websites: List[Dict], since: datetime, until: datetime) -> Dict[str, List[Interval]]:
+    """피드별로 아직 수집하지 않은 구간 {rss: [(since, until), ...]} (빈 목록이면 수집할 필요 없음)"""
+    covered = load()
+    return {site["rss"]: gaps(covered.get(site["rss"], []), since, until) for site in websites}
+
+
+def is_covered(websites: List[Dict], since: datetime, until: datetime) -> bool:
+    """모든 피드가 [since, until)을 이미 수집했는지"""
+    return not any(plan(websites, since, until).values())
+
+
+def record(intervals: Dict[str, List[Interval]]):
+    """피드별 수집 완료 구간 저장 (기존 구간과 합쳐짐)"""
+    db.add_coverage({
+        rss: [(since.isoformat(), until.isoformat()) for since, until in spans]
+        for rss, spans in intervals.items()
+    })
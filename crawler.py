@@ -1,18 +1,44 @@
 """
 웹 크롤러 - RSS 피드 기반 기사 수집
 """
+import asyncio
+import aiohttp
 import feedparser
+import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict
-from datetime import datetime, timezone
+from typing import Callable, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
 import time
 
+import db
+from metrics import RunMetrics
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 FETCH_TIMEOUT = 15
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 1.0
+USER_AGENT = "Mozilla/5.0"
+
+# 크롤 엔진: "thread" (기존 ThreadPoolExecutor) 또는 "async" (asyncio + 공유 커넥션 풀)
+CRAWL_ENGINE = os.environ.get("CRAWL_ENGINE", "thread")
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 2
+PARSE_WORKERS = 4
+# 피드 파싱 방식: "thread" (수집 스레드/스레드 풀에서 파싱) 또는
+# "process" (원문 bytes를 프로세스 풀에 넘겨 파싱 - feedparser·HTML 정리가 GIL에 묶이지 않음)
+PARSE_MODE = os.environ.get("PARSE_MODE", "thread")
+PARSE_PROCESSES = int(os.environ.get("PARSE_PROCESSES", os.cpu_count() or 1))
 
 
 def _parse_published(entry) -> datetime:
@@ -27,90 +53,741 @@ def _parse_published(entry) -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _strip_html(html: str) -> str:
-    """HTML 태그 제거 후 텍스트 반환"""
-    if not html:
-        return ""
+# BeautifulSoup이 get_text에서 빼는 문자열 컨테이너 태그
+_RAW_TEXT_TAGS = {"script", "style"}
+# 안쪽 텍스트 전체를 빼는 등 빠른 경로가 따라 하지 않는 태그 → BeautifulSoup으로 처리
+_FALLBACK_TAGS = {"template", "rt", "rp"}
+# 빠른 경로가 bs4와 같은 결과를 내려고 빌려 쓰는 bs4 내부 구현 (공개 API가 아님).
+# 설치된 bs4에 없으면 빠른 경로를 끄고 모든 입력을 BeautifulSoup으로 처리한다.
+try:
+    from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+    from bs4.dammit import EntitySubstitution
+
+    _dereference_charref = BeautifulSoupHTMLParser._dereference_numeric_character_reference
+    _ENTITY_TO_CHARACTER = EntitySubstitution.HTML_ENTITY_TO_CHARACTER
+except (ImportError, AttributeError):
+    _dereference_charref = _ENTITY_TO_CHARACTER = None
+
+
+class _Fallback(Exception):
+    """빠른 경로가 BeautifulSoup과 같은 결과를 보장할 수 없는 입력"""
+
+
+class _LimitReached(Exception):
+    """필요한 길이만큼 텍스트를 모음 - 파싱 중단"""
+
+
+class _TextExtractor(HTMLParser):
+    """트리를 만들지 않고 BeautifulSoup(html, "html.parser").get_text(" ", strip=True)과
+    같은 텍스트를 뽑는 태그 제거기
+
+    bs4와 같은 HTMLParser 토크나이저와 문자 참조 변환 규칙을 쓰고,
+    태그·주석 경계마다 텍스트 조각을 strip해 모은다.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        super().__init__(convert_charrefs=False)
+        self.limit = limit
+        self.pieces: List[str] = []
+        self.length = -1  # " ".join(pieces)의 길이
+        self._current: List[str] = []
+        self._raw_text = False
+
+    def flush(self):
+        if not self._current:
+            return
+        text = "".join(self._current).strip()
+        self._current = []
+        if text and not self._raw_text:
+            self.pieces.append(text)
+            self.length += len(text) + 1
+            if self.limit is not None and self.length >= self.limit:
+                raise _LimitReached()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _FALLBACK_TAGS:
+            raise _Fallback(tag)
+        self.flush()
+        self._raw_text = tag in _RAW_TEXT_TAGS
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _FALLBACK_TAGS:
+            raise _Fallback(tag)
+        self.flush()
+
+    def handle_endtag(self, tag):
+        self.flush()
+        self._raw_text = False
+
+    def handle_data(self, data):
+        self._current.append(data)
+
+    def handle_charref(self, name):
+        dereferenced, _, extra_data = _dereference_charref(name)
+        self._current.append(dereferenced)
+        self._current.append(extra_data)
+
+    def handle_entityref(self, name):
+        character = _ENTITY_TO_CHARACTER.get(name)
+        self._current.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def unknown_decl(self, data):
+        self.flush()
+        if data.upper().startswith("CDATA["):
+            self._current.append(data[len("CDATA["):])
+            self.flush()
+
+
+def _extract_text(html: str, limit: Optional[int] = None) -> str:
+    """_TextExtractor로 텍스트 추출 - limit자 이상 모이면 나머지 HTML은 파싱하지 않음
+
+    HTMLParser는 feed 호출 단위에 따라 깨진 입력을 다르게 해석하므로, bs4와 똑같이
+    한 번의 feed + close로 넣고 조기 종료는 처리기에서 예외로 빠져나온다.
+    """
+    parser = _TextExtractor(limit)
+    try:
+        parser.feed(html)
+        parser.close()
+        parser.flush()
+    except _LimitReached:
+        pass
+    return " ".join(parser.pieces)
+
+
+def _strip_html_soup(html: str) -> str:
+    """BeautifulSoup으로 HTML 태그 제거 (빠른 경로가 처리하지 못하는 입력용)"""
     try:
         return BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)
     except Exception:
         return html
 
 
+def _strip_html(html: str, limit: Optional[int] = None) -> str:
+    """HTML 태그 제거 후 텍스트 반환 (limit이 있으면 앞 limit자까지)
+
+    결과는 BeautifulSoup get_text와 같고, 빠른 경로가 처리하지 못하는 입력만 BeautifulSoup을 쓴다.
+    """
+    if not html:
+        return ""
+    if _ENTITY_TO_CHARACTER is None:
+        return _strip_html_soup(html)[:limit]
+    try:
+        text = _extract_text(html, limit)
+    except Exception:
+        text = _strip_html_soup(html)
+    return text[:limit]
+
+
 def _ensure_utc(dt: datetime) -> datetime:
     """datetime을 UTC-aware로 변환"""
     return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
 
 
-def _fetch_feed(website: Dict, since_date: datetime, until_date: datetime) -> List[Dict]:
-    """단일 RSS 피드에서 기사 수집"""
+def _window_covered(cache: Optional[Dict], since: datetime, until: datetime) -> bool:
+    """이전 수집 구간이 이번 요청 구간을 덮는지 확인
+
+    304 응답은 '마지막 수집 이후 변경 없음'만 의미하므로, 이전에 처리한 구간이
+    [since, min(until, 마지막 수집 시각)) 을 포함할 때만 조건부 요청 결과를 신뢰한다.
+    until은 크롤 시작 직전에 계산되므로 수집 시각과의 차이(크롤 소요 시간)는 허용한다.
+    """
+    if not cache or not cache.get("window_since") or not cache.get("fetched_at"):
+        return False
+    try:
+        prev_since = datetime.fromisoformat(cache["window_since"])
+        prev_until = datetime.fromisoformat(cache["window_until"])
+        fetched_at = datetime.fromisoformat(cache["fetched_at"])
+    except (TypeError, ValueError):
+        return False
+    slack = timedelta(seconds=FETCH_TIMEOUT * 2)
+    return prev_since <= since and prev_until + slack >= min(until, fetched_at)
+
+
+def _conditional_ok(
+    cache: Optional[Dict],
+    since: datetime,
+    until: datetime,
+    gaps: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> bool:
+    """조건부 요청(304 = 변경 없음)을 보내도 되는지
+
+    gaps(미수집 구간)가 있으면 모든 구간이 이전 수집 이후에 시작할 때만 보낸다.
+    이전 수집에서 보고도 분류를 마치지 못한 구간은 본문이 그대로여도 다시 받아 처리해야 하기 때문.
+    """
+    if not _window_covered(cache, since, until):
+        return False
+    if gaps is None:
+        return True
+    prev_until = datetime.fromisoformat(cache["window_until"])
+    return all(start >= prev_until for start, _ in gaps)
+
+
+def _fetch_raw(rss_url: str, cache: Optional[Dict]) -> Dict:
+    """RSS 원문 요청 (캐시가 있으면 If-None-Match / If-Modified-Since 포함)
+
+    timings의 wait는 요청부터 응답 헤더까지(DNS·연결 포함), download는 본문 수신 시간.
+    """
+    started = time.perf_counter()
+    response = requests.get(rss_url, headers=_request_headers(cache), timeout=FETCH_TIMEOUT)
+    if response.status_code != 304:
+        response.raise_for_status()
+    wait = response.elapsed.total_seconds()
+    return {
+        "status": response.status_code,
+        "content": response.content,
+        "url": response.url,
+        "content_type": response.headers.get("Content-Type", ""),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "timings": {"wait": wait, "download": max(0.0, time.perf_counter() - started - wait)},
+    }
+
+
+def _request_headers(cache: Optional[Dict]) -> Dict[str, str]:
+    """요청 헤더 구성 (조건부 요청 헤더 포함)"""
+    headers = {"User-Agent": USER_AGENT}
+    if cache:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    return headers
+
+
+def _error_result(error: Optional[str] = None) -> Dict:
+    """수집 실패 시 피드 결과"""
+    return {
+        "articles": [], "cache": None, "status": "error", "skipped_known": 0,
+        "entries": 0, "bytes": 0, "timings": {}, "error": error,
+    }
+
+
+def _parse_feed(
+    website: Dict,
+    raw: Dict,
+    since: datetime,
+    until: datetime,
+    cache: Optional[Dict],
+    fetched_at: datetime,
+    skip_known: bool = True,
+    gaps: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Dict:
+    """받아온 RSS 원문을 파싱해 기간 내 기사 추출
+
+    skip_known=True이면 DB에 이미 있는 링크를 HTML 정리 전에 건너뛴다.
+    gaps가 있으면 [since, until) 중 그 구간들(아직 수집하지 않은 구간)에 발행된 entry만 추출한다.
+
+    Returns:
+        {"articles": 기사 목록, "cache": 갱신할 피드 캐시 또는 None,
+         "status": "hit" | "miss" | "error", "skipped_known": 건너뛴 기존 기사 수,
+         "entries": 기간 내 entry 수, "bytes": 원문 크기,
+         "timings": 단계별 소요 시간(초) - 요청 단계(_fetch_raw) + parse/strip, "error": 실패 사유}
+    """
     name = website["name"]
-    rss_url = website["rss"]
+    result = _error_result()
+    timings = dict(raw.get("timings") or {})
+    result.update(bytes=len(raw["content"]), timings=timings)
+    covered = _window_covered(cache, since, until)
+    if raw["status"] == 304:
+        logger.info(f"♻️ {name}: 변경 없음 (304)")
+        new_cache = dict(cache)
+        new_cache["fetched_at"] = fetched_at.isoformat()
+        new_cache["window_until"] = max(
+            datetime.fromisoformat(cache["window_until"]), until
+        ).isoformat()
+        result.update(cache=new_cache, status="hit")
+        return result
+
+    parse_started = time.perf_counter()
+    feed = feedparser.parse(
+        raw["content"],
+        response_headers={
+            "content-location": raw["url"],
+            "content-type": raw["content_type"],
+        },
+    )
+    if feed.get("bozo") and not feed.get("entries"):
+        logger.warning(f"⚠️ {name}: RSS 파싱 오류 (bozo={feed.bozo_exception})")
+        timings["parse"] = time.perf_counter() - parse_started
+        result["error"] = f"RSS 파싱 오류: {str(feed.bozo_exception)[:60]}"
+        return result
+
+    # 이전 수집 구간에서 이미 처리한 entry는 HTML 정리 전에 건너뜀
+    # (gaps가 있으면 처리를 마친 구간은 이미 빠져 있고, 남은 구간은 분류 실패분까지 다시 봐야 함)
+    seen_ids = set(cache.get("entry_ids", [])) if covered and gaps is None else set()
+    prev_since = datetime.fromisoformat(cache["window_since"]) if covered else None
+    prev_until = datetime.fromisoformat(cache["window_until"]) if covered else None
+    entry_ids = []
+    candidates = []
+    for entry in feed.entries:
+        try:
+            link = getattr(entry, "link", "").strip()
+            entry_id = getattr(entry, "id", "") or link
+            if entry_id:
+                entry_ids.append(entry_id)
+            if not link:
+                continue
+            pub_dt = _parse_published(entry)
+            if not (since <= pub_dt < until):
+                continue
+            if gaps is not None and not any(start <= pub_dt < end for start, end in gaps):
+                continue
+            if entry_id in seen_ids and prev_since <= pub_dt < prev_until:
+                continue
+            candidates.append((entry, link, pub_dt))
+        except Exception as e:
+            logger.debug(f"⚠️ {name} entry 오류: {e}")
+            continue
+
+    timings["parse"] = time.perf_counter() - parse_started
+
+    # DB에 이미 있는 링크는 BeautifulSoup / AI 단계로 넘기지 않음
+    known = db.get_known_links([link for _, link, _ in candidates]) if skip_known else set()
     articles = []
+    strip_started = time.perf_counter()
+    for entry, link, pub_dt in candidates:
+        if link in known:
+            continue
+        try:
+            title = _strip_html(getattr(entry, "title", "")).strip()
+            if not title:
+                continue
+            # content: summary 또는 description
+            raw_content = (
+                getattr(entry, "summary", "")
+                or getattr(entry, "description", "")
+                or ""
+            )
+            content = _strip_html(raw_content, limit=2000)
+            articles.append({
+                "title": title,
+                "link": link,
+                "source": name,
+                "content": content,
+                "published_at": pub_dt.isoformat(),
+                "crawled_at": datetime.now(timezone.utc).isoformat(),
+            })
+        except Exception as e:
+            logger.debug(f"⚠️ {name} entry 오류: {e}")
+            continue
+    timings["strip"] = time.perf_counter() - strip_started
+
+    # 이전 구간과 이어지면 합쳐서 기록 (다음 조건부 요청에서 304를 신뢰하기 위함).
+    # 다른 주차 요청이라도 ETag가 같으면 본문이 그대로이므로 이전 구간을 유지한다.
+    etag = raw["etag"]
+    window_since, window_until = since, until
+    if cache and cache.get("window_since") and (covered or (etag and etag == cache.get("etag"))):
+        prev_since = datetime.fromisoformat(cache["window_since"])
+        prev_until = datetime.fromisoformat(cache["window_until"])
+        if prev_since <= until and since <= prev_until:
+            window_since = min(prev_since, since)
+            window_until = max(prev_until, until)
+    new_cache = {
+        "etag": etag,
+        "last_modified": raw["last_modified"],
+        "fetched_at": fetched_at.isoformat(),
+        "window_since": window_since.isoformat(),
+        "window_until": window_until.isoformat(),
+        "entry_ids": entry_ids,
+    }
+    logger.info(f"✅ {name}: {len(articles)}개 기사 수집 (기존 {len(known)}개 건너뜀)")
+    result.update(
+        articles=articles, cache=new_cache, status="miss", skipped_known=len(known),
+        entries=len(candidates),
+    )
+    return result
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """파싱용 프로세스 풀 (최초 호출 시 생성해 크롤 간 재사용)
+
+    Streamlit 등 스레드가 도는 프로세스에서 fork하지 않도록 spawn으로 띄운다.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARSE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """깨진 프로세스 풀을 버려 다음 호출에서 새로 만들도록 함"""
+    global _process_pool
+    logger.warning("⚠️ 파싱 프로세스 풀 오류 - 이번 피드는 스레드에서 파싱")
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+
+
+def _drop_known(result: Dict) -> Dict:
+    """프로세스 풀에서 skip_known=False로 파싱한 결과에서 DB에 이미 있는 링크 제외
+
+    spawn된 자식 프로세스는 부모가 바꾼 db.DB_FILE을 모르고 스키마 초기화까지 다시 하므로
+    DB 조회는 부모 프로세스에서 한다.
+    """
+    articles = result["articles"]
+    known = db.get_known_links([article["link"] for article in articles]) if articles else set()
+    if known:
+        result["articles"] = [article for article in articles if article["link"] not in known]
+        result["skipped_known"] += len(known)
+    return result
+
+
+def _parse_in_process(
+    website: Dict,
+    raw: Dict,
+    since: datetime,
+    until: datetime,
+    cache: Optional[Dict],
+    fetched_at: datetime,
+    skip_known: bool = True,
+    gaps: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Dict:
+    """_parse_feed를 프로세스 풀에서 실행 (풀이 깨졌으면 현재 스레드에서 실행)
+
+    자식 프로세스는 DB를 쓰지 않고, 기존 링크 제외는 부모에서 _drop_known으로 한다.
+    """
+    pool = _get_process_pool()
+    try:
+        result = pool.submit(
+            _parse_feed, website, raw, since, until, cache, fetched_at, False, gaps
+        ).result()
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        return _parse_feed(website, raw, since, until, cache, fetched_at, skip_known, gaps)
+    return _drop_known(result) if skip_known else result
+
+
+def _fetch_feed(
+    website: Dict,
+    since_date: datetime,
+    until_date: datetime,
+    cache: Optional[Dict] = None,
+    skip_known: bool = True,
+    parse_mode: str = PARSE_MODE,
+    gaps: Optional[List[Tuple[datetime, datetime]]] = None,
+) -> Dict:
+    """단일 RSS 피드에서 기사 수집 (요청 + 파싱, 반환 형식은 _parse_feed 참고)"""
     since = _ensure_utc(since_date)
     until = _ensure_utc(until_date)
+    fetched_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
     try:
-        feed = feedparser.parse(rss_url, agent="Mozilla/5.0", request_headers={"Connection": "close"})
-        if feed.get("bozo") and not feed.get("entries"):
-            logger.warning(f"⚠️ {name}: RSS 파싱 오류 (bozo={feed.bozo_exception})")
-            return []
-        for entry in feed.entries:
-            try:
-                pub_dt = _parse_published(entry)
-                if not (since <= pub_dt < until):
-                    continue
-                title = _strip_html(getattr(entry, "title", "")).strip()
-                if not title:
-                    continue
-                link = getattr(entry, "link", "").strip()
-                if not link:
-                    continue
-                # content: summary 또는 description
-                raw_content = (
-                    getattr(entry, "summary", "")
-                    or getattr(entry, "description", "")
-                    or ""
+        conditional = _conditional_ok(cache, since, until, gaps)
+        raw = _fetch_raw(website["rss"], cache if conditional else None)
+        parse = _parse_in_process if parse_mode == "process" else _parse_feed
+        result = parse(website, raw, since, until, cache, fetched_at, skip_known, gaps)
+    except Exception as e:
+        logger.warning(f"⚠️ {website['name']}: 피드 수집 실패 - {str(e)[:80]}")
+        result = _error_result(str(e)[:80])
+    result["timings"]["total"] = time.perf_counter() - started
+    return result
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """요청별 DNS 조회·연결·응답 헤더 대기 시간을 trace_request_ctx(dict)에 누적하는 추적기
+
+    wait는 요청 시작부터 응답 헤더까지에서 DNS·연결 시간을 뺀 값 (커넥션 풀 대기 포함).
+    keep-alive로 재사용한 연결은 dns/connect가 0으로 남는다.
+    """
+
+    def mark(key):
+        async def handler(session, ctx, params):
+            ctx.marks[key] = time.perf_counter()
+        return handler
+
+    def add(stage, start_key):
+        async def handler(session, ctx, params):
+            timings = ctx.trace_request_ctx
+            if timings is not None and start_key in ctx.marks:
+                timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - ctx.marks[start_key]
+        return handler
+
+    async def on_request_start(session, ctx, params):
+        ctx.marks = {"request": time.perf_counter()}
+
+    async def on_request_end(session, ctx, params):
+        timings = ctx.trace_request_ctx
+        if timings is not None:
+            elapsed = time.perf_counter() - ctx.marks["request"]
+            timings["wait"] = timings.get("wait", 0.0) + elapsed
+            timings["headers_at"] = time.perf_counter()
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_dns_resolvehost_start.append(mark("dns"))
+    config.on_dns_resolvehost_end.append(add("dns", "dns"))
+    config.on_connection_create_start.append(mark("connect"))
+    config.on_connection_create_end.append(add("connect", "connect"))
+    config.on_request_end.append(on_request_end)
+    return config
+
+
+async def _fetch_raw_async(
+    session: aiohttp.ClientSession, rss_url: str, cache: Optional[Dict]
+) -> Dict:
+    """RSS 원문 비동기 요청 (429/5xx·네트워크 오류는 지수 백오프로 재시도)
+
+    세션에 _trace_config()가 붙어 있으면 timings에 dns/connect/wait/download가 채워진다.
+    """
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    timings: Dict[str, float] = {}
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            async with session.get(
+                rss_url, headers=_request_headers(cache), timeout=timeout,
+                trace_request_ctx=timings,
+            ) as resp:
+                if resp.status != 304:
+                    resp.raise_for_status()
+                content = await resp.read() if resp.status != 304 else b""
+                headers_at = timings.pop("headers_at", None)
+                timings["download"] = time.perf_counter() - headers_at if headers_at else 0.0
+                # 요청 시작~헤더 시간에서 DNS·연결 시간을 분리
+                timings["wait"] = max(
+                    0.0, timings.get("wait", 0.0) - timings.get("dns", 0.0) - timings.get("connect", 0.0)
                 )
-                content = _strip_html(raw_content)[:2000]
-                articles.append({
-                    "title": title,
-                    "link": link,
-                    "source": name,
+                return {
+                    "status": resp.status,
                     "content": content,
-                    "published_at": pub_dt.isoformat(),
-                    "crawled_at": datetime.now(timezone.utc).isoformat(),
-                })
-            except Exception as e:
-                logger.debug(f"⚠️ {name} entry 오류: {e}")
-                continue
-        logger.info(f"✅ {name}: {len(articles)}개 기사 수집")
-    except Exception as e:
-        logger.warning(f"⚠️ {name}: 피드 수집 실패 - {str(e)[:80]}")
-    return articles
+                    "url": str(resp.url),
+                    "content_type": resp.headers.get("Content-Type", ""),
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "timings": timings,
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500
+            if not retryable or attempt == FETCH_RETRIES:
+                raise
+            delay = FETCH_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+            logger.debug(f"🔁 {rss_url}: {attempt + 1}회 재시도 ({delay:.1f}s 후) - {str(e)[:60]}")
+            await asyncio.sleep(delay)
 
 
-def crawl_all(websites: List[Dict], since_date: datetime, until_date: datetime) -> List[Dict]:
-    """모든 RSS 피드에서 기사 병렬 수집 후 URL 중복 제거"""
-    all_articles: List[Dict] = []
-    seen_links: set = set()
+async def _crawl_async(
+    websites: List[Dict],
+    since: datetime,
+    until: datetime,
+    caches: Dict[str, Dict],
+    skip_known: bool = True,
+    on_feed: Optional[Callable[[Dict, Dict], None]] = None,
+    parse_mode: str = PARSE_MODE,
+    windows: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None,
+) -> List[Tuple[Dict, Dict]]:
+    """공유 커넥션 풀로 모든 피드를 비동기 요청하고, 파싱은 워커 풀(스레드 또는 프로세스)에서 처리"""
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    loop = asyncio.get_running_loop()
+    # 프로세스 풀은 크롤 간 공유하므로 여기서 종료하지 않음
+    pool_context = (
+        nullcontext(_get_process_pool()) if parse_mode == "process"
+        else ThreadPoolExecutor(max_workers=PARSE_WORKERS)
+    )
+
+    with pool_context as parse_pool:
+        async with aiohttp.ClientSession(
+            connector=connector, trace_configs=[_trace_config()]
+        ) as session:
+
+            async def crawl_one(site: Dict):
+                cache = caches.get(site["rss"])
+                fetched_at = datetime.now(timezone.utc)
+                started = time.perf_counter()
+                gaps = windows.get(site["rss"]) if windows else None
+                try:
+                    conditional = _conditional_ok(cache, since, until, gaps)
+                    raw = await _fetch_raw_async(session, site["rss"], cache if conditional else None)
+                    args = (site, raw, since, until, cache, fetched_at, skip_known, gaps)
+                    try:
+                        if parse_mode == "process":
+                            # 자식 프로세스는 DB를 쓰지 않으므로 기존 링크 제외는 여기서
+                            result = await loop.run_in_executor(
+                                parse_pool, _parse_feed, *args[:6], False, gaps
+                            )
+                            if skip_known:
+                                result = await loop.run_in_executor(None, _drop_known, result)
+                        else:
+                            result = await loop.run_in_executor(parse_pool, _parse_feed, *args)
+                    except BrokenProcessPool:
+                        _discard_process_pool(parse_pool)
+                        result = await loop.run_in_executor(None, _parse_feed, *args)
+                except Exception as e:
+                    logger.warning(f"⚠️ {site['name']}: 피드 수집 실패 - {str(e)[:80]}")
+                    result = _error_result(str(e)[:80])
+                result["timings"]["total"] = time.perf_counter() - started
+                if on_feed:
+                    # 콜백이 막혀도(배압) 이벤트 루프는 다른 피드 수신을 계속하도록 스레드에서 실행
+                    await loop.run_in_executor(None, on_feed, site, result)
+                return site, result
 
-    logger.info(f"🚀 {len(websites)}개 사이트 RSS 크롤링 시작 ({since_date.date()} ~ {until_date.date()})")
+            return await asyncio.gather(*(crawl_one(site) for site in websites))
 
+
+def _crawl_threaded(
+    websites: List[Dict],
+    since: datetime,
+    until: datetime,
+    caches: Dict[str, Dict],
+    skip_known: bool = True,
+    on_feed: Optional[Callable[[Dict, Dict], None]] = None,
+    parse_mode: str = PARSE_MODE,
+    windows: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None,
+) -> List[Tuple[Dict, Dict]]:
+    """스레드 풀에서 피드별 요청 + 파싱 (parse_mode="process"이면 파싱만 프로세스 풀에서)
+
+    전체 대기 한도(FETCH_TIMEOUT * 2)에는 on_feed 콜백이 막혀 있던 시간은 포함하지 않는다.
+    한도 안에 끝나지 않은 피드는 오류로 처리한다.
+    """
+    results = []
     with ThreadPoolExecutor(max_workers=20) as executor:
         futures = {
-            executor.submit(_fetch_feed, site, since_date, until_date): site
+            executor.submit(
+                _fetch_feed, site, since, until, caches.get(site["rss"]), skip_known, parse_mode,
+                windows.get(site["rss"]) if windows else None,
+            ): site
             for site in websites
         }
-        for future in as_completed(futures, timeout=FETCH_TIMEOUT * 2):
-            site = futures[future]
-            try:
-                articles = future.result(timeout=FETCH_TIMEOUT)
-                for a in articles:
-                    if a["link"] not in seen_links:
-                        seen_links.add(a["link"])
-                        all_articles.append(a)
-            except Exception as e:
-                logger.warning(f"⚠️ {site['name']}: {str(e)[:60]}")
-
-    logger.info(f"📊 총 {len(all_articles)}개 기사 수집 완료")
+        pending = set(futures)
+        remaining = FETCH_TIMEOUT * 2
+        while pending:
+            waited = time.monotonic()
+            finished, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            remaining -= time.monotonic() - waited
+            if not finished:
+                for future in pending:
+                    logger.warning(f"⚠️ {futures[future]['name']}: 시간 초과")
+                finished, pending = pending, set()
+            for future in finished:
+                site = futures[future]
+                try:
+                    result = future.result(timeout=0)
+                except Exception as e:
+                    logger.warning(f"⚠️ {site['name']}: {str(e)[:60]}")
+                    result = _error_result(str(e)[:80] or "시간 초과")
+                results.append((site, result))
+                if on_feed:
+                    on_feed(site, result)
+    return results
+
+
+def crawl_all(
+    websites: List[Dict],
+    since_date: datetime,
+    until_date: datetime,
+    use_cache: bool = True,
+    engine: str = CRAWL_ENGINE,
+    skip_known: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+    on_articles: Optional[Callable[[List[Dict]], None]] = None,
+    parse_mode: str = PARSE_MODE,
+    metrics: Optional[RunMetrics] = None,
+    windows: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None,
+    on_feed_done: Optional[Callable[[Dict, str], None]] = None,
+    pending_caches: Optional[Dict[str, Dict]] = None,
+) -> List[Dict]:
+    """모든 RSS 피드에서 기사 병렬 수집 후 URL 중복 제거
+
+    use_cache=True이면 피드별 ETag/Last-Modified로 조건부 요청을 보내고,
+    304 응답을 받은 피드는 파싱을 건너뛴다.
+    skip_known=True이면 이미 저장/AI 처리된 링크는 결과에서 제외한다.
+    engine="thread"는 기존 스레드 풀 방식, engine="async"는 asyncio + keep-alive 커넥션 풀 방식.
+    parse_mode="process"이면 요청은 그대로 두고 파싱·기간 필터·HTML 정리만 프로세스 풀에서 한다.
+    progress가 있으면 피드 하나가 끝날 때마다 progress(완료 피드 수, 전체 피드 수)를 호출한다.
+    on_articles가 있으면 피드가 끝날 때마다 그 피드의 새 기사 목록을 넘기고 결과를 모아 두지 않는다
+    (반환값은 빈 목록). 콜백이 막히면 다음 피드 처리도 기다리므로 그대로 배압이 된다.
+    metrics(metrics.RunMetrics)가 있으면 피드별 단계 시간·상태를 기록한다.
+    windows({rss: [(since, until), ...]})가 있으면 피드마다 그 구간(crawl_coverage.plan의 미수집 구간)에
+    발행된 기사만 수집하고, 빈 목록인 피드는 요청하지 않는다. 없는 피드는 [since_date, until_date) 전체.
+    on_feed_done이 있으면 피드 하나의 기사를 넘긴 뒤 on_feed_done(site, "hit" | "miss" | "error")를 호출한다.
+
+    피드 캐시(entry ID·수집 구간)는 다음 크롤이 그 entry를 건너뛰고 304를 믿는 근거이므로
+    기사가 저장·처리된 뒤에만 남아야 한다. pending_caches가 있으면 캐시를 저장하지 않고
+    {rss: 캐시}를 여기에 담아 두고, 호출자가 기사 처리를 마친 피드만 db.save_feed_caches로 저장한다.
+    """
+    all_articles: List[Dict] = []
+    seen_links: set = set()
+    caches = db.get_feed_caches() if use_cache else {}
+    updated_caches: Dict[str, Dict] = {}
+    stats = {"hit": 0, "miss": 0, "error": 0, "skipped_known": 0}
+    since = _ensure_utc(since_date)
+    until = _ensure_utc(until_date)
+
+    if windows is not None:
+        skipped = [site for site in websites if windows.get(site["rss"]) == []]
+        websites = [site for site in websites if windows.get(site["rss"]) != []]
+        if skipped:
+            logger.info(f"⏭️ {len(skipped)}개 피드는 요청 구간을 이미 수집해 건너뜀")
+    if not websites:
+        return all_articles
+
+    logger.info(
+        f"🚀 {len(websites)}개 사이트 RSS 크롤링 시작 "
+        f"({since_date.date()} ~ {until_date.date()}, engine={engine}, parse={parse_mode})"
+    )
+    started = time.perf_counter()
+    done = 0
+    total = 0
+    lock = threading.Lock()
+
+    def on_feed(site: Dict, result: Dict):
+        # async 엔진은 콜백을 여러 스레드에서 호출하므로 잠금 안에서 집계
+        nonlocal done, total
+        with lock:
+            done += 1
+            stats[result["status"]] += 1
+            stats["skipped_known"] += result["skipped_known"]
+            if result["cache"]:
+                updated_caches[site["rss"]] = result["cache"]
+            if metrics:
+                metrics.record_feed(site["name"], result)
+            fresh = []
+            for a in result["articles"]:
+                if a["link"] not in seen_links:
+                    seen_links.add(a["link"])
+                    fresh.append(a)
+            total += len(fresh)
+            if on_articles:
+                # 엔진이 들고 있는 결과 목록에 기사가 남지 않도록 비움
+                result["articles"] = []
+                if fresh:
+                    on_articles(fresh)
+            else:
+                all_articles.extend(fresh)
+            if on_feed_done:
+                on_feed_done(site, result["status"])
+            if progress:
+                progress(done, len(websites))
+
+    if engine == "async":
+        asyncio.run(_crawl_async(
+            websites, since, until, caches, skip_known, on_feed, parse_mode, windows
+        ))
+    else:
+        _crawl_threaded(websites, since, until, caches, skip_known, on_feed, parse_mode, windows)
+
+    if use_cache:
+        if pending_caches is None:
+            db.save_feed_caches(updated_caches)
+        else:
+            pending_caches.update(updated_caches)
+
+    logger.info(
+        f"📊 총 {total}개 기사 수집 완료 ({time.perf_counter() - started:.1f}s, "
+        f"캐시 hit {stats['hit']} / miss {stats['miss']} / 오류 {stats['error']}, "
+        f"기존 기사 {stats['skipped_known']}개 건너뜀)"
+    )
     return all_articles
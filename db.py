@@ -4,157 +4,996 @@ SQLite 데이터베이스 관리
 import sqlite3
 import json
 import hashlib
-import os
+import html
 import logging
-from typing import List, Dict, Set
+import os
+import re
+import threading
+import time
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
-DB_FILE = "samsung_news.db"
+# 앱과 scheduler.py가 같은 DB를 보도록 공유 저장소 경로를 DB_FILE 환경 변수로 지정할 수 있음
+DB_FILE = os.environ.get("DB_FILE", "samsung_news.db")
+
+# 커넥션마다 적용하는 PRAGMA (WAL: 읽기와 쓰기가 서로 막지 않음)
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",  # 약 20MB 페이지 캐시
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA temp_store=MEMORY",
+)
+# 쓰기 잠금 대기 시간 (초)
+BUSY_TIMEOUT = 30
+# 커넥션별 prepared statement 캐시 크기
+STATEMENT_CACHE_SIZE = 256
 
+_local = threading.local()
+# 이 프로세스에서 스키마 확인을 마친 DB 파일 (ensure_schema)
+_schema_ready: Set[str] = set()
+_schema_lock = threading.RLock()
 
-def _connect():
-    return sqlite3.connect(DB_FILE)
+
+def _connect() -> sqlite3.Connection:
+    """현재 스레드 전용 커넥션 반환 (스레드마다 한 번 열어 재사용)
+
+    `with _connect() as conn:` 블록은 정상 종료 시 commit, 예외 시 rollback 한다.
+    커넥션을 재사용하므로 prepared statement 캐시도 호출 간에 유지된다.
+    DB 파일을 처음 쓸 때 프로세스당 한 번 스키마를 확인한다 (ensure_schema).
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != DB_FILE:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(
+            DB_FILE, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
+        _local.path = DB_FILE
+    if DB_FILE not in _schema_ready and not getattr(_local, "initializing", False):
+        ensure_schema()
+    return conn
+
+
+def ensure_schema():
+    """현재 DB_FILE의 스키마를 이 프로세스에서 아직 확인하지 않았으면 init_db 실행
+
+    import 시점이 아니라 첫 DB 접근 때 한 번만 실행되므로 Streamlit 재실행마다 반복되지 않는다.
+    """
+    if DB_FILE in _schema_ready:
+        return
+    with _schema_lock:
+        if DB_FILE not in _schema_ready:
+            init_db()
+
+
+def close_connection():
+    """현재 스레드의 커넥션 닫기 (스레드 종료 전 정리용)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def _ensure_column(cursor, table: str, column: str, decl: str):
+    """기존 DB에 없는 컬럼 추가 (스키마 마이그레이션)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+# 전문 검색 인덱스 (FTS5 external content - 본문은 articles에만 두고 토큰 인덱스만 유지).
+# prefix 인덱스로 "Infin*" 같은 접두어 검색도 인덱스에서 바로 찾는다.
+_FTS_COLUMNS = ("title", "summary", "content", "companies")
+_FTS_SCHEMA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        {", ".join(_FTS_COLUMNS)},
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+# articles 변경을 같은 트랜잭션 안에서 인덱스에 반영 (INSERT OR IGNORE로 무시된 행은 트리거도 실행 안 됨)
+_FTS_NEW = ", ".join(f"new.{c}" for c in _FTS_COLUMNS)
+_FTS_OLD = ", ".join(f"old.{c}" for c in _FTS_COLUMNS)
+_FTS_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, {", ".join(_FTS_COLUMNS)}) VALUES (new.id, {_FTS_NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, {", ".join(_FTS_COLUMNS)})
+        VALUES ('delete', old.id, {_FTS_OLD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_update
+    AFTER UPDATE OF {", ".join(_FTS_COLUMNS)} ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, {", ".join(_FTS_COLUMNS)})
+        VALUES ('delete', old.id, {_FTS_OLD});
+        INSERT INTO articles_fts (rowid, {", ".join(_FTS_COLUMNS)}) VALUES (new.id, {_FTS_NEW});
+    END""",
+)
+# SQLite가 FTS5 없이 빌드된 경우 False - search_articles는 LIKE 검색으로 대신한다
+_fts_enabled = True
+
+
+def _ensure_fts(cursor) -> bool:
+    """전문 검색 테이블·동기화 트리거 생성, 새로 만들었으면 기존 기사로 인덱스 채우기"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'")
+    existed = cursor.fetchone() is not None
+    try:
+        cursor.execute(_FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"⚠️ FTS5 사용 불가, 검색은 LIKE로 대체: {e}")
+        return False
+    for trigger in _FTS_TRIGGERS:
+        cursor.execute(trigger)
+    if not existed:
+        cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        logger.info("✅ 전문 검색 인덱스 생성")
+    return True
+
+
+# PRAGMA user_version으로 관리하는 일회성 데이터 마이그레이션 버전
+SCHEMA_VERSION = 1
+
+
+def _migrate(cursor):
+    """user_version 기준으로 밀린 데이터 마이그레이션 실행"""
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+    if version < 1:
+        # JSON 컬럼 → 정규화 테이블
+        cursor.execute("""
+            INSERT OR IGNORE INTO article_categories (category, article_id)
+            SELECT j.value, a.id FROM articles a, json_each(a.categories) j
+            WHERE json_valid(a.categories) AND json_type(a.categories) = 'array'
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO article_companies (company, article_id)
+            SELECT TRIM(j.value), a.id FROM articles a, json_each(a.companies) j
+            WHERE json_valid(a.companies) AND json_type(a.companies) = 'array'
+              AND j.type = 'text' AND TRIM(j.value) != ''
+        """)
+        logger.info("✅ 카테고리/기업 정규화 테이블 마이그레이션 완료")
+    if version < SCHEMA_VERSION:
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def init_db():
-    """데이터베이스 초기화"""
-    conn = _connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            link TEXT UNIQUE NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT,
-            summary TEXT,
-            source TEXT,
-            companies TEXT,
-            categories TEXT,
-            published_at TEXT,
-            crawled_at TEXT,
-            week_offset INTEGER DEFAULT 0
+    """데이터베이스 초기화 (테이블·인덱스 생성과 마이그레이션, 여러 번 호출해도 안전)"""
+    with _schema_lock:
+        _local.initializing = True
+        try:
+            _create_schema()
+        finally:
+            _local.initializing = False
+        _schema_ready.add(DB_FILE)
+
+
+def _create_schema():
+    with _connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                link TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT,
+                summary TEXT,
+                source TEXT,
+                companies TEXT,
+                categories TEXT,
+                published_at TEXT,
+                crawled_at TEXT,
+                minhash BLOB,
+                alt_links TEXT
+            )
+        """)
+        # 이전 버전 DB에는 크롤 시점 기준 상대 주차(week_offset) 컬럼이 남아 있지만 더 쓰지 않는다.
+        # 조회는 절대 시각인 published_at(UTC ISO 8601) 구간으로 한다.
+        # 중복 제거용 MinHash 서명 (dedup.py)
+        _ensure_column(cursor, "articles", "minhash", "BLOB")
+        # 같은 기사를 실은 다른 출처 링크 [{"source": ..., "link": ...}, ...]
+        _ensure_column(cursor, "articles", "alt_links", "TEXT")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS read_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                api_key_hash TEXT NOT NULL,
+                article_link TEXT NOT NULL,
+                read_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(api_key_hash, article_link)
+            )
+        """)
+
+        # AI 분류까지 마친 링크 (유럽 무관 판정으로 articles에 저장되지 않은 기사 포함)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS processed_links (
+                link TEXT PRIMARY KEY,
+                processed_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Gemini 분류 결과 캐시 (프롬프트·모델·카테고리 버전 해시 → 파싱된 JSON)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                rss TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at TEXT,
+                window_since TEXT,
+                window_until TEXT,
+                entry_ids TEXT
+            )
+        """)
+
+        # 백그라운드 크롤 작업 큐 (worker.py) - status: queued → running → done / failed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                week_offset INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                started_at TEXT,
+                finished_at TEXT,
+                feeds_total INTEGER DEFAULT 0,
+                feeds_done INTEGER DEFAULT 0,
+                articles_found INTEGER DEFAULT 0,
+                classify_total INTEGER DEFAULT 0,
+                articles_classified INTEGER DEFAULT 0,
+                articles_stored INTEGER DEFAULT 0,
+                ai_failed INTEGER DEFAULT 0,
+                error TEXT
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_crawl_jobs_status ON crawl_jobs(status, id)"
+        )
+
+        # 크롤 성능 기록 (metrics.py) - 실행 1회 / 실행별 피드 / AI 호출·DB 쓰기 등 단계 표본
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER,
+                week_offset INTEGER,
+                engine TEXT,
+                parse_mode TEXT,
+                started_at TEXT,
+                finished_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                elapsed REAL,
+                feeds INTEGER DEFAULT 0,
+                feed_errors INTEGER DEFAULT 0,
+                found INTEGER DEFAULT 0,
+                classified INTEGER DEFAULT 0,
+                stored INTEGER DEFAULT 0,
+                ai_failed INTEGER DEFAULT 0,
+                ai_calls INTEGER DEFAULT 0,
+                ai_retries INTEGER DEFAULT 0,
+                prompt_tokens INTEGER DEFAULT 0,
+                output_tokens INTEGER DEFAULT 0,
+                error TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_stats (
+                run_id INTEGER NOT NULL,
+                feed TEXT NOT NULL,
+                status TEXT,
+                entries INTEGER,
+                articles INTEGER,
+                bytes INTEGER,
+                dns REAL,
+                connect REAL,
+                wait REAL,
+                download REAL,
+                parse REAL,
+                strip REAL,
+                total REAL,
+                error TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_feed_stats_run ON feed_stats(run_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stage_samples (
+                run_id INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                seconds REAL NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_samples_run ON stage_samples(run_id)")
+
+        # 피드(rss)별로 수집·AI 분류까지 마친 published_at 구간 [since, until) - 겹치는 구간은 합쳐 저장
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_coverage (
+                rss TEXT NOT NULL,
+                since TEXT NOT NULL,
+                until TEXT NOT NULL,
+                PRIMARY KEY (rss, since)
+            ) WITHOUT ROWID
+        """)
+
+        # 앱 단위 메타데이터 (data_version: 기사 데이터가 바뀔 때마다 1씩 증가)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+        # 정규화된 카테고리/기업 테이블 (필터는 여기서 인덱스로 조회).
+        # articles.categories / companies JSON은 목록 표시용 사본으로만 유지한다.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_categories (
+                category TEXT NOT NULL,
+                article_id INTEGER NOT NULL,
+                PRIMARY KEY (category, article_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_companies (
+                company TEXT NOT NULL COLLATE NOCASE,
+                article_id INTEGER NOT NULL,
+                PRIMARY KEY (company, article_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_article_categories_article "
+            "ON article_categories(article_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_article_companies_article "
+            "ON article_companies(article_id)"
         )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS read_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            api_key_hash TEXT NOT NULL,
-            article_link TEXT NOT NULL,
-            read_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(api_key_hash, article_link)
+        _migrate(cursor)
+
+        global _fts_enabled
+        _fts_enabled = _ensure_fts(cursor)
+
+        # 조회 인덱스 (기간 조회·날짜순 정렬·출처별 조회).
+        # read_history의 (api_key_hash, article_link) 조회는 UNIQUE 제약이 만든
+        # 자동 인덱스가 그대로 커버링 인덱스 역할을 하므로 별도 인덱스를 두지 않는다.
+        # 인덱스 끝에 rowid(id)가 붙으므로 (published_at, id) 키셋 페이지 순서를 그대로 제공
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at)"
         )
-    """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
+        # week_offset 조회용이던 이전 버전 인덱스 정리 (쓰기마다 갱신 비용만 듦)
+        cursor.execute("DROP INDEX IF EXISTS idx_articles_week_published")
+        cursor.execute("DROP INDEX IF EXISTS idx_articles_week_id")
+        cursor.execute("PRAGMA optimize")
 
-    conn.commit()
-    conn.close()
     logger.info("✅ DB 초기화 완료")
 
 
-def insert_articles(articles: List[Dict], week_offset: int):
-    """기사 목록을 DB에 저장 (중복 무시)"""
+def _bump_data_version(conn: sqlite3.Connection):
+    """기사 데이터 변경 표시 - 같은 트랜잭션 안에서 호출"""
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('data_version', 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+    )
+
+
+def data_version() -> int:
+    """기사 데이터 버전 (조회 결과 캐시 무효화 키로 사용)"""
+    try:
+        with _connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+            return row[0] if row else 0
+    except Exception as e:
+        logger.warning(f"⚠️ data_version 오류: {e}")
+        return 0
+
+
+def _article_row(article: Dict) -> tuple:
+    return (
+        article.get("link", ""),
+        article.get("title", ""),
+        article.get("content", ""),
+        article.get("summary", ""),
+        article.get("source", ""),
+        json.dumps(article.get("companies", []), ensure_ascii=False),
+        json.dumps(article.get("categories", []), ensure_ascii=False),
+        article.get("published_at", ""),
+        article.get("crawled_at", ""),
+        article.get("minhash"),
+        json.dumps(article.get("alt_links", []), ensure_ascii=False),
+    )
+
+
+_INSERT_ARTICLE_SQL = """
+    INSERT OR IGNORE INTO articles
+        (link, title, content, summary, source, companies, categories,
+         published_at, crawled_at, minhash, alt_links)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _insert_tags(conn: sqlite3.Connection, inserted: List[Tuple[int, Dict]]):
+    """이번에 새로 저장한 (id, 기사)로 카테고리/기업 정규화 테이블 채우기
+
+    INSERT OR IGNORE로 건너뛴 기존 링크는 넘기지 않는다 - 태그가 저장된 categories/companies와 어긋나지 않도록.
+    """
+    conn.executemany(
+        "INSERT OR IGNORE INTO article_categories (category, article_id) VALUES (?, ?)",
+        [(c, article_id) for article_id, a in inserted for c in a.get("categories") or []],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO article_companies (company, article_id) VALUES (?, ?)",
+        [
+            (c.strip(), article_id)
+            for article_id, a in inserted
+            for c in a.get("companies") or []
+            if isinstance(c, str) and c.strip()
+        ],
+    )
+
+
+def insert_articles(articles: List[Dict]) -> Dict[str, int]:
+    """기사 목록을 한 트랜잭션으로 DB에 저장 (중복 무시)
+
+    Returns:
+        {"inserted": 새로 저장된 수, "ignored": 이미 있던 링크 수, "failed": 오류 수}
+    """
+    counts = {"inserted": 0, "ignored": 0, "failed": 0}
     if not articles:
-        return
-    conn = _connect()
-    cursor = conn.cursor()
+        return counts
+    rows = []
     for article in articles:
         try:
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO articles
-                    (link, title, content, summary, source, companies, categories,
-                     published_at, crawled_at, week_offset)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    article.get("link", ""),
-                    article.get("title", ""),
-                    article.get("content", ""),
-                    article.get("summary", ""),
-                    article.get("source", ""),
-                    json.dumps(article.get("companies", []), ensure_ascii=False),
-                    json.dumps(article.get("categories", []), ensure_ascii=False),
-                    article.get("published_at", ""),
-                    article.get("crawled_at", ""),
-                    week_offset,
-                ),
-            )
+            if not article.get("link") or not article.get("title"):
+                raise ValueError("link/title 없음")
+            rows.append((_article_row(article), article))
         except Exception as e:
+            counts["failed"] += 1
             logger.debug(f"⚠️ insert 오류: {e}")
-    conn.commit()
-    conn.close()
-    logger.info(f"✅ {len(articles)}개 기사 저장 (week_offset={week_offset})")
-
-
-def get_articles(week_offset: int) -> List[Dict]:
-    """주어진 week_offset의 기사 목록 반환"""
-    conn = _connect()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT link, title, content, summary, source, companies, categories, "
-        "published_at, crawled_at, week_offset FROM articles WHERE week_offset = ?",
-        (week_offset,),
+
+    # 행마다 실행해 실제로 저장된 행의 id만 모음 (실패한 행은 그 행만 제외)
+    inserted: List[Tuple[int, Dict]] = []
+    try:
+        with _connect() as conn:
+            for row, article in rows:
+                try:
+                    cursor = conn.execute(_INSERT_ARTICLE_SQL, row)
+                except Exception as row_error:
+                    counts["failed"] += 1
+                    logger.debug(f"⚠️ insert 오류: {row_error}")
+                    continue
+                if cursor.rowcount:
+                    inserted.append((cursor.lastrowid, article))
+            _insert_tags(conn, inserted)
+            if inserted:
+                _bump_data_version(conn)
+        counts["inserted"] = len(inserted)
+    except Exception as e:
+        logger.warning(f"⚠️ insert 오류: {e}")
+        counts["failed"] = len(articles)
+    counts["ignored"] = len(articles) - counts["inserted"] - counts["failed"]
+    logger.info(
+        f"✅ {counts['inserted']}개 기사 저장 ("
+        f"중복 {counts['ignored']}개, 오류 {counts['failed']}개)"
     )
-    rows = cursor.fetchall()
-    conn.close()
-    articles = []
-    for row in rows:
-        articles.append({
-            "link": row[0],
-            "title": row[1],
-            "content": row[2],
-            "summary": row[3],
-            "source": row[4],
-            "companies": json.loads(row[5]) if row[5] else [],
-            "categories": json.loads(row[6]) if row[6] else [],
-            "published_at": row[7],
-            "crawled_at": row[8],
-            "week_offset": row[9],
-        })
-    return articles
-
-
-def get_max_week_offset() -> int:
-    """현재 DB에 저장된 최대 week_offset 반환"""
-    try:
-        conn = _connect()
+    return counts
+
+
+_ARTICLE_COLUMNS = (
+    "link, title, content, summary, source, companies, categories, "
+    "published_at, crawled_at, minhash, alt_links"
+)
+
+
+def _row_to_article(row: tuple) -> Dict:
+    return {
+        "link": row[0],
+        "title": row[1],
+        "content": row[2],
+        "summary": row[3],
+        "source": row[4],
+        "companies": json.loads(row[5]) if row[5] else [],
+        "categories": json.loads(row[6]) if row[6] else [],
+        "published_at": row[7],
+        "crawled_at": row[8],
+        "minhash": row[9],
+        "alt_links": json.loads(row[10]) if row[10] else [],
+    }
+
+
+class ArticleRow(NamedTuple):
+    """목록 화면용 기사 한 줄 - 표시에 필요한 컬럼만 담은 튜플 (content/summary/minhash 제외)
+
+    요약·본문은 필요할 때 get_article(id)로 따로 조회한다.
+    """
+    id: int
+    link: str
+    title: str
+    source: str
+    categories: tuple
+    published_at: str
+    alt_links: tuple
+    snippet: Optional[str] = None  # 검색 결과 발췌 (escape된 HTML, <mark>만 태그)
+
+
+_LIST_COLUMNS = "articles.id, link, title, source, categories, published_at, alt_links"
+
+
+def _row_to_list_item(row: tuple, snippet: Optional[str] = None) -> ArticleRow:
+    return ArticleRow(
+        row[0], row[1], row[2], row[3],
+        tuple(json.loads(row[4])) if row[4] else (),
+        row[5],
+        tuple(json.loads(row[6])) if row[6] else (),
+        snippet,
+    )
+
+
+def _filter_clause(category: Optional[str], company: Optional[str]) -> tuple:
+    """카테고리/기업 필터 SQL 조건과 파라미터 (정규화 테이블 PK 인덱스 조회)"""
+    clauses, params = [], []
+    if category:
+        clauses.append(
+            "EXISTS (SELECT 1 FROM article_categories c "
+            "WHERE c.category = ? AND c.article_id = articles.id)"
+        )
+        params.append(category)
+    if company:
+        clauses.append(
+            "EXISTS (SELECT 1 FROM article_companies m "
+            "WHERE m.company = ? AND m.article_id = articles.id)"
+        )
+        params.append(company)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def _range_clause(since: Optional[str], until: Optional[str]) -> tuple:
+    """published_at 구간 [since, until) 조건 (None이면 그쪽은 열린 구간)"""
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("published_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("published_at < ?")
+        params.append(until)
+    return " AND ".join(clauses) or "1", params
+
+
+def get_articles(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    category: Optional[str] = None,
+    company: Optional[str] = None,
+) -> List[Dict]:
+    """published_at이 [since, until)인 기사 목록을 최신순으로 반환
+
+    since/until은 UTC ISO 8601 문자열 (datetime.isoformat()), category/company가 있으면 SQL에서 필터.
+    """
+    where, params = _range_clause(since, until)
+    extra, extra_params = _filter_clause(category, company)
+    with _connect() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT MAX(week_offset) FROM articles")
-        result = cursor.fetchone()
-        conn.close()
-        return result[0] if result and result[0] is not None else 0
+        cursor.execute(
+            f"SELECT {_ARTICLE_COLUMNS} FROM articles "
+            f"WHERE {where}{extra} ORDER BY published_at DESC, id DESC",
+            params + extra_params,
+        )
+        rows = cursor.fetchall()
+    return [_row_to_article(row) for row in rows]
+
+
+def get_article_list(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    category: Optional[str] = None,
+    company: Optional[str] = None,
+) -> List[ArticleRow]:
+    """get_articles와 같은 조건·순서의 목록용 ArticleRow (본문·요약·서명을 읽지 않음)"""
+    where, params = _range_clause(since, until)
+    extra, extra_params = _filter_clause(category, company)
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {_LIST_COLUMNS} FROM articles "
+            f"WHERE {where}{extra} ORDER BY published_at DESC, id DESC",
+            params + extra_params,
+        )
+        return [_row_to_list_item(row) for row in cursor]
+
+
+def get_article(article_id: int) -> Optional[Dict]:
+    """기사 한 건의 전체 컬럼 (목록에서 요약·본문을 펼칠 때)"""
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {_ARTICLE_COLUMNS} FROM articles WHERE id = ?", (article_id,))
+            row = cursor.fetchone()
+    except Exception as e:
+        logger.warning(f"⚠️ get_article 오류: {e}")
+        return None
+    if row is None:
+        return None
+    article = _row_to_article(row)
+    article["id"] = article_id
+    return article
+
+
+def _unread_clause(
+    api_key_hash: str,
+    since: Optional[str],
+    category: Optional[str],
+    read_before: Optional[str],
+) -> tuple:
+    """기간·카테고리·안 읽음 조건 (read_history UNIQUE 인덱스로 조회)
+
+    read_before('YYYY-MM-DD HH:MM:SS', UTC)가 있으면 그 이전에 읽은 기사만 제외한다.
+    화면을 보는 동안 읽음 처리된 기사 때문에 페이지 경계가 밀리지 않게 하기 위함.
+    """
+    where, params = _range_clause(since, None)
+    extra, extra_params = _filter_clause(category, None)
+    read_filter = "r.api_key_hash = ? AND r.article_link = articles.link"
+    read_params = [api_key_hash]
+    if read_before is not None:
+        read_filter += " AND r.read_at < ?"
+        read_params.append(read_before)
+    return (
+        f"{where}{extra}"
+        f" AND NOT EXISTS (SELECT 1 FROM read_history r WHERE {read_filter})",
+        params + extra_params + read_params,
+    )
+
+
+def get_unread_page(
+    api_key_hash: str,
+    since: Optional[str] = None,
+    category: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: int = 10,
+    read_before: Optional[str] = None,
+) -> tuple:
+    """since 이후 발행된 안 읽은 기사 한 페이지를 최신순 키셋 페이지네이션으로 반환
+
+    after는 이전 페이지 마지막 기사의 (published_at, id) 키. OFFSET 없이 인덱스 위치에서
+    바로 시작하므로 앞 페이지 수와 무관하게 비용이 일정하다.
+
+    Returns:
+        (ArticleRow 목록, 다음 페이지 존재 여부)
+    """
+    where, params = _unread_clause(api_key_hash, since, category, read_before)
+    if after is not None:
+        where += " AND (published_at, id) < (?, ?)"
+        params += list(after)
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {_LIST_COLUMNS} FROM articles WHERE {where} "
+            f"ORDER BY published_at DESC, id DESC LIMIT ?",
+            params + [limit + 1],
+        )
+        rows = cursor.fetchall()
+    return [_row_to_list_item(row) for row in rows[:limit]], len(rows) > limit
+
+
+def count_unread(
+    api_key_hash: str,
+    since: Optional[str] = None,
+    category: Optional[str] = None,
+    read_before: Optional[str] = None,
+) -> int:
+    """since 이후 발행된 카테고리의 안 읽은 기사 수"""
+    where, params = _unread_clause(api_key_hash, since, category, read_before)
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM articles WHERE {where}", params)
+            return cursor.fetchone()[0]
+    except Exception:
+        return 0
+
+
+# 검색 순위 bm25 가중치 (title, summary, content, companies) - 제목·기업명 일치를 본문보다 우선
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 8.0)
+# 검색 결과 발췌에서 일치한 단어를 감싸는 표시. snippet()은 제어 문자로 표시하고
+# 본문을 HTML escape한 뒤에 태그로 바꾼다 (피드 원문의 태그가 화면에 그대로 들어가지 않도록).
+SNIPPET_MARKS = ("<mark>", "</mark>")
+_SNIPPET_SENTINELS = ("\x02", "\x03")
+SNIPPET_TOKENS = 24
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+def _search_terms(query: str) -> List[str]:
+    """검색어를 단어 목록으로 (FTS5 연산자·따옴표 등 특수문자는 버림)"""
+    return _SEARCH_TERM.findall(query or "")
+
+
+def _fts_match(terms: List[str]) -> str:
+    """단어마다 접두어 일치, 모든 단어 포함 (따옴표로 감싸 AND/OR/NOT도 일반 단어로 취급)"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _search_source(terms: List[str]) -> tuple:
+    """검색 일치 행을 내는 FROM 절과 파라미터 - score가 작을수록 관련도 높음
+
+    FTS5가 있으면 단어마다 접두어 일치("Infin" → Infineon)를 모두 만족하는 행을 bm25로 순위 매기고,
+    없으면 네 컬럼 LIKE 검색 (순위는 최신순)으로 대신한다.
+    """
+    if _fts_enabled:
+        return (
+            "(SELECT rowid AS hit_id, bm25(articles_fts, ?, ?, ?, ?) AS score "
+            "FROM articles_fts WHERE articles_fts MATCH ?) hits "
+            "JOIN articles ON articles.id = hits.hit_id",
+            list(SEARCH_WEIGHTS) + [_fts_match(terms)],
+        )
+    column_match = " OR ".join(f"articles.{c} LIKE ?" for c in _FTS_COLUMNS)
+    return (
+        "(SELECT id AS hit_id, 0 AS score FROM articles WHERE "
+        + " AND ".join(f"({column_match})" for _ in terms)
+        + ") hits JOIN articles ON articles.id = hits.hit_id",
+        [f"%{term}%" for term in terms for _ in _FTS_COLUMNS],
+    )
+
+
+def _snippets(conn: sqlite3.Connection, terms: List[str], ids: List[int]) -> Dict[int, str]:
+    """결과 페이지 기사만 본문 일치 부분 발췌 (전체 일치 행에 snippet()을 계산하지 않도록 따로 조회)"""
+    if not ids or not _fts_enabled:
+        return {}
+    cursor = conn.execute(
+        f"SELECT rowid, snippet(articles_fts, 2, ?, ?, '…', ?) FROM articles_fts "
+        f"WHERE articles_fts MATCH ? AND rowid IN ({','.join('?' * len(ids))})",
+        [*_SNIPPET_SENTINELS, SNIPPET_TOKENS, _fts_match(terms)] + ids,
+    )
+    return {article_id: _highlight(text) for article_id, text in cursor.fetchall()}
+
+
+def _highlight(text: Optional[str]) -> str:
+    """발췌문을 HTML로 - 원문은 escape하고 일치 표시만 <mark> 태그로"""
+    escaped = html.escape(text or "")
+    for sentinel, mark in zip(_SNIPPET_SENTINELS, SNIPPET_MARKS):
+        escaped = escaped.replace(sentinel, mark)
+    return escaped
+
+
+def search_articles(
+    query: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    category: Optional[str] = None,
+    company: Optional[str] = None,
+    order: str = "rank",
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple:
+    """제목·요약·본문·기업명 전문 검색 (FTS5 인덱스), 한 페이지 반환
+
+    검색어의 모든 단어를 포함하는 기사를 order="rank"면 관련도순, "recent"면 최신순으로 정렬한다.
+    since/until/category/company는 get_articles와 같은 조건.
+
+    Returns:
+        (ArticleRow 목록 - snippet에 본문 일치 부분 발췌 (없으면 요약, escape된 HTML), 다음 페이지 존재 여부)
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return [], False
+    source, source_params = _search_source(terms)
+    where, params = _range_clause(since, until)
+    extra, extra_params = _filter_clause(category, company)
+    order_by = "hits.score, articles.id DESC" if order == "rank" else "published_at DESC, articles.id DESC"
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_LIST_COLUMNS}, summary FROM {source} "
+                f"WHERE {where}{extra} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                source_params + params + extra_params + [limit + 1, offset],
+            )
+            rows = cursor.fetchall()
+            snippets = _snippets(conn, terms, [row[0] for row in rows[:limit]])
+    except Exception as e:
+        logger.warning(f"⚠️ search_articles 오류: {e}")
+        return [], False
+    return [
+        _row_to_list_item(row, snippets.get(row[0]) or _highlight(row[-1])) for row in rows[:limit]
+    ], len(rows) > limit
+
+
+def count_search(
+    query: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    category: Optional[str] = None,
+    company: Optional[str] = None,
+) -> int:
+    """search_articles 조건에 맞는 기사 수"""
+    terms = _search_terms(query)
+    if not terms:
+        return 0
+    source, source_params = _search_source(terms)
+    where, params = _range_clause(since, until)
+    extra, extra_params = _filter_clause(category, company)
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {source} WHERE {where}{extra}",
+                source_params + params + extra_params,
+            )
+            return cursor.fetchone()[0]
     except Exception:
         return 0
 
 
+def add_alt_links(alt_links: Dict[str, List[Dict]]):
+    """저장된 기사에 다른 출처 링크 추가 {기사 link: [{"source", "link"}, ...]}"""
+    if not alt_links:
+        return
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            for link, new_links in alt_links.items():
+                cursor.execute("SELECT alt_links FROM articles WHERE link = ?", (link,))
+                row = cursor.fetchone()
+                if row is None:
+                    continue
+                merged = json.loads(row[0]) if row[0] else []
+                known = {a["link"] for a in merged} | {link}
+                merged.extend(a for a in new_links if a["link"] not in known)
+                cursor.execute(
+                    "UPDATE articles SET alt_links = ? WHERE link = ?",
+                    (json.dumps(merged, ensure_ascii=False), link),
+                )
+            _bump_data_version(conn)
+    except Exception as e:
+        logger.warning(f"⚠️ add_alt_links 오류: {e}")
+
+
+def save_minhashes(signatures: List[tuple]):
+    """기존 기사에 나중에 계산한 MinHash 서명 저장 [(link, blob), ...]"""
+    if not signatures:
+        return
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE articles SET minhash = ? WHERE link = ?",
+                [(blob, link) for link, blob in signatures],
+            )
+    except Exception as e:
+        logger.debug(f"⚠️ save_minhashes 오류: {e}")
+
+
+def get_known_links(links: List[str]) -> Set[str]:
+    """이미 저장되었거나 AI 처리된 링크 반환 (articles.link UNIQUE 인덱스 / processed_links PK 조회)"""
+    known: Set[str] = set()
+    if not links:
+        return known
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(links), 500):
+                chunk = links[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"SELECT link FROM articles WHERE link IN ({placeholders}) "
+                    f"UNION SELECT link FROM processed_links WHERE link IN ({placeholders})",
+                    chunk + chunk,
+                )
+                known.update(row[0] for row in cursor.fetchall())
+    except Exception as e:
+        logger.debug(f"⚠️ get_known_links 오류: {e}")
+    return known
+
+
+def mark_links_processed(links: List[str]):
+    """AI 처리를 마친 링크 기록 (다음 크롤에서 재분류하지 않도록)"""
+    if not links:
+        return
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR IGNORE INTO processed_links (link) VALUES (?)",
+                [(link,) for link in links],
+            )
+    except Exception as e:
+        logger.warning(f"⚠️ mark_links_processed 오류: {e}")
+
+
+def _merge_intervals(intervals: List[tuple]) -> List[tuple]:
+    """겹치거나 맞닿은 [since, until) 구간 합치기 (ISO 문자열은 사전순 = 시간순)"""
+    merged: List[list] = []
+    for since, until in sorted(intervals):
+        if merged and since <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], until)
+        else:
+            merged.append([since, until])
+    return [tuple(interval) for interval in merged]
+
+
+def get_coverage() -> Dict[str, List[tuple]]:
+    """rss별 수집 완료 구간 {rss: [(since, until), ...]} (시간순, 서로 겹치지 않음)"""
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                "SELECT rss, since, until FROM crawl_coverage ORDER BY rss, since"
+            ).fetchall()
+        coverage: Dict[str, List[tuple]] = {}
+        for rss, since, until in rows:
+            coverage.setdefault(rss, []).append((since, until))
+        return coverage
+    except Exception as e:
+        logger.warning(f"⚠️ get_coverage 오류: {e}")
+        return {}
+
+
+def add_coverage(intervals: Dict[str, List[tuple]]):
+    """rss별 수집 완료 구간 추가 - 기존 구간과 합쳐 한 트랜잭션으로 저장"""
+    intervals = {rss: spans for rss, spans in intervals.items() if spans}
+    if not intervals:
+        return
+    try:
+        with _connect() as conn:
+            # 읽고 합쳐 다시 쓰는 동안 다른 크롤(워커·scheduler.py)의 기록이 끼어들지 않도록 쓰기 잠금
+            conn.execute("BEGIN IMMEDIATE")
+            for rss, spans in intervals.items():
+                existing = conn.execute(
+                    "SELECT since, until FROM crawl_coverage WHERE rss = ?", (rss,)
+                ).fetchall()
+                conn.execute("DELETE FROM crawl_coverage WHERE rss = ?", (rss,))
+                conn.executemany(
+                    "INSERT INTO crawl_coverage (rss, since, until) VALUES (?, ?, ?)",
+                    [(rss, since, until) for since, until in _merge_intervals(existing + list(spans))],
+                )
+    except Exception as e:
+        logger.warning(f"⚠️ add_coverage 오류: {e}")
+
+
 def mark_read(api_key_hash: str, link: str):
     """기사를 읽음으로 표시"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR IGNORE INTO read_history (api_key_hash, article_link) VALUES (?, ?)",
-            (api_key_hash, link),
-        )
-        conn.commit()
-        conn.close()
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR IGNORE INTO read_history (api_key_hash, article_link) VALUES (?, ?)",
+                (api_key_hash, link),
+            )
     except Exception as e:
         logger.debug(f"⚠️ mark_read 오류: {e}")
 
 
+def mark_read_many(api_key_hash: str, links: List[str]) -> bool:
+    """여러 기사를 한 트랜잭션으로 읽음 표시, 성공 여부 반환"""
+    if not links:
+        return True
+    try:
+        with _connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO read_history (api_key_hash, article_link) VALUES (?, ?)",
+                [(api_key_hash, link) for link in links],
+            )
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ mark_read_many 오류: {e}")
+        return False
+
+
 def is_read(api_key_hash: str, link: str) -> bool:
     """기사가 읽혔는지 확인"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT 1 FROM read_history WHERE api_key_hash = ? AND article_link = ?",
-            (api_key_hash, link),
-        )
-        result = cursor.fetchone()
-        conn.close()
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM read_history WHERE api_key_hash = ? AND article_link = ?",
+                (api_key_hash, link),
+            )
+            result = cursor.fetchone()
         return result is not None
     except Exception:
         return False
@@ -163,14 +1002,13 @@ def is_read(api_key_hash: str, link: str) -> bool:
 def get_read_links(api_key_hash: str) -> Set[str]:
     """해당 API key hash의 모든 읽은 기사 링크 반환"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT article_link FROM read_history WHERE api_key_hash = ?",
-            (api_key_hash,),
-        )
-        rows = cursor.fetchall()
-        conn.close()
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT article_link FROM read_history WHERE api_key_hash = ?",
+                (api_key_hash,),
+            )
+            rows = cursor.fetchall()
         return {row[0] for row in rows}
     except Exception:
         return set()
@@ -179,11 +1017,15 @@ def get_read_links(api_key_hash: str) -> Set[str]:
 def clear_articles():
     """articles 테이블 초기화"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM articles")
-        conn.commit()
-        conn.close()
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM articles")
+            cursor.execute("DELETE FROM article_categories")
+            cursor.execute("DELETE FROM article_companies")
+            cursor.execute("DELETE FROM processed_links")
+            cursor.execute("DELETE FROM feed_cache")
+            cursor.execute("DELETE FROM crawl_coverage")
+            _bump_data_version(conn)
         logger.info("✅ articles 테이블 초기화")
     except Exception as e:
         logger.error(f"❌ clear_articles 오류: {e}")
@@ -192,11 +1034,10 @@ def clear_articles():
 def article_count() -> int:
     """저장된 기사 수 반환"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM articles")
-        result = cursor.fetchone()
-        conn.close()
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM articles")
+            result = cursor.fetchone()
         return result[0] if result else 0
     except Exception:
         return 0
@@ -205,20 +1046,336 @@ def article_count() -> int:
 def has_properly_categorized_articles() -> bool:
     """반도체 단독이 아닌 카테고리로 분류된 기사가 있는지 확인"""
     try:
-        conn = _connect()
-        cursor = conn.cursor()
-        cursor.execute("SELECT categories FROM articles")
-        rows = cursor.fetchall()
-        conn.close()
-        for row in rows:
-            cats = json.loads(row[0]) if row[0] else []
-            if cats and cats != ["반도체"]:
-                return True
-        return False
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM article_categories WHERE category != ?)",
+                ("반도체",),
+            )
+            return bool(cursor.fetchone()[0])
     except Exception:
         return False
 
 
-# DB 초기화 (파일 없으면 자동 생성)
-if not os.path.exists(DB_FILE):
-    init_db()
+def get_feed_caches() -> Dict[str, Dict]:
+    """RSS URL별 조건부 요청 캐시(ETag/Last-Modified, 마지막 수집 구간, entry ID) 반환"""
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT rss, etag, last_modified, fetched_at, window_since, window_until, "
+                "entry_ids FROM feed_cache"
+            )
+            rows = cursor.fetchall()
+        return {
+            row[0]: {
+                "etag": row[1],
+                "last_modified": row[2],
+                "fetched_at": row[3],
+                "window_since": row[4],
+                "window_until": row[5],
+                "entry_ids": json.loads(row[6]) if row[6] else [],
+            }
+            for row in rows
+        }
+    except Exception as e:
+        logger.debug(f"⚠️ get_feed_caches 오류: {e}")
+        return {}
+
+
+def save_feed_caches(caches: Dict[str, Dict]):
+    """RSS URL별 조건부 요청 캐시 저장 (기존 값 덮어쓰기)"""
+    if not caches:
+        return
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO feed_cache
+                    (rss, etag, last_modified, fetched_at, window_since, window_until, entry_ids)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        rss,
+                        cache.get("etag"),
+                        cache.get("last_modified"),
+                        cache.get("fetched_at"),
+                        cache.get("window_since"),
+                        cache.get("window_until"),
+                        json.dumps(cache.get("entry_ids", []), ensure_ascii=False),
+                    )
+                    for rss, cache in caches.items()
+                ],
+            )
+    except Exception as e:
+        logger.warning(f"⚠️ save_feed_caches 오류: {e}")
+
+
+def get_ai_cache(key: str, ttl: float) -> Optional[Dict]:
+    """AI 결과 캐시 조회 (ttl초보다 오래된 항목은 없는 것으로 간주)"""
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            now = time.time()
+            cursor.execute(
+                "SELECT result FROM ai_cache WHERE key = ? AND created_at >= ?",
+                (key, now - ttl),
+            )
+            row = cursor.fetchone()
+            if row:
+                cursor.execute("UPDATE ai_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]) if row else None
+    except Exception as e:
+        logger.debug(f"⚠️ get_ai_cache 오류: {e}")
+        return None
+
+
+def put_ai_cache(key: str, result: Dict):
+    """AI 결과 캐시 저장"""
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            now = time.time()
+            cursor.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), now, now),
+            )
+    except Exception as e:
+        logger.debug(f"⚠️ put_ai_cache 오류: {e}")
+
+
+def evict_ai_cache(max_entries: int, ttl: float) -> int:
+    """만료(TTL)된 항목과 최근 사용 순으로 max_entries를 넘는 항목 삭제, 삭제 수 반환"""
+    try:
+        with _connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM ai_cache WHERE created_at < ?", (time.time() - ttl,))
+            removed = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM ai_cache WHERE key IN "
+                "(SELECT key FROM ai_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max_entries,),
+            )
+            removed += cursor.rowcount
+        return removed
+    except Exception as e:
+        logger.debug(f"⚠️ evict_ai_cache 오류: {e}")
+        return 0
+
+
+_JOB_COLUMNS = (
+    "id", "week_offset", "status", "created_at", "started_at", "finished_at",
+    "feeds_total", "feeds_done", "articles_found", "classify_total",
+    "articles_classified", "articles_stored", "ai_failed", "error",
+)
+# update_crawl_job으로 갱신할 수 있는 진행 상황 컬럼
+_JOB_PROGRESS_FIELDS = set(_JOB_COLUMNS[6:13])
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+def enqueue_crawl_job(week_offset: int) -> Optional[int]:
+    """크롤 작업 등록, 작업 id 반환 (같은 주차의 대기/실행 중 작업이 있으면 그 id)"""
+    try:
+        with _connect() as conn:
+            row = conn.execute(
+                "SELECT id FROM crawl_jobs WHERE week_offset = ? AND status IN (?, ?) "
+                "ORDER BY id LIMIT 1",
+                (week_offset, *ACTIVE_JOB_STATUSES),
+            ).fetchone()
+            if row:
+                return row[0]
+            return conn.execute(
+                "INSERT INTO crawl_jobs (week_offset) VALUES (?)", (week_offset,)
+            ).lastrowid
+    except Exception as e:
+        logger.error(f"❌ enqueue_crawl_job 오류: {e}")
+        return None
+
+
+def claim_crawl_job() -> Optional[Dict]:
+    """가장 오래된 대기 작업을 running으로 바꾸고 반환 (없으면 None)
+
+    status='queued' 조건으로 UPDATE하므로 여러 워커가 동시에 호출해도 한 곳만 가져간다.
+    """
+    try:
+        with _connect() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT id FROM crawl_jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                claimed = conn.execute(
+                    "UPDATE crawl_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ? AND status = 'queued'",
+                    (row[0],),
+                ).rowcount
+                if claimed:
+                    break
+        return get_crawl_job(row[0])
+    except Exception as e:
+        logger.error(f"❌ claim_crawl_job 오류: {e}")
+        return None
+
+
+def update_crawl_job(job_id: int, **progress):
+    """작업 진행 상황 갱신 (feeds_done=3, articles_stored=10 ...)"""
+    fields = {k: v for k, v in progress.items() if k in _JOB_PROGRESS_FIELDS}
+    if not fields:
+        return
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    try:
+        with _connect() as conn:
+            conn.execute(
+                f"UPDATE crawl_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
+    except Exception as e:
+        logger.debug(f"⚠️ update_crawl_job 오류: {e}")
+
+
+def finish_crawl_job(job_id: int, error: Optional[str] = None):
+    """작업 종료 기록 (error가 있으면 failed)"""
+    try:
+        with _connect() as conn:
+            conn.execute(
+                "UPDATE crawl_jobs SET status = ?, error = ?, finished_at = CURRENT_TIMESTAMP "
+                "WHERE id = ?",
+                ("failed" if error else "done", error, job_id),
+            )
+    except Exception as e:
+        logger.error(f"❌ finish_crawl_job 오류: {e}")
+
+
+def get_crawl_job(job_id: int) -> Optional[Dict]:
+    """작업 조회"""
+    try:
+        with _connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM crawl_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(_JOB_COLUMNS, row)) if row else None
+    except Exception as e:
+        logger.warning(f"⚠️ get_crawl_job 오류: {e}")
+        return None
+
+
+def get_active_crawl_jobs() -> List[Dict]:
+    """대기/실행 중 작업 목록 (오래된 순)"""
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM crawl_jobs "
+                "WHERE status IN (?, ?) ORDER BY id",
+                ACTIVE_JOB_STATUSES,
+            ).fetchall()
+        return [dict(zip(_JOB_COLUMNS, row)) for row in rows]
+    except Exception as e:
+        logger.warning(f"⚠️ get_active_crawl_jobs 오류: {e}")
+        return []
+
+
+def requeue_running_crawl_jobs(stale_after: float = 0) -> int:
+    """중단된(running으로 남은) 작업을 다시 대기열로, 되돌린 수 반환 - 워커 시작 시 호출
+
+    stale_after(초)보다 오래 전에 시작된 작업만 되돌린다 (다른 프로세스가 실행 중인 작업 보호).
+    """
+    try:
+        with _connect() as conn:
+            return conn.execute(
+                "UPDATE crawl_jobs SET status = 'queued', started_at = NULL "
+                "WHERE status = 'running' AND started_at <= datetime('now', ?)",
+                (f"-{int(stale_after)} seconds",),
+            ).rowcount
+    except Exception as e:
+        logger.warning(f"⚠️ requeue_running_crawl_jobs 오류: {e}")
+        return 0
+
+
+_RUN_COLUMNS = (
+    "id", "job_id", "week_offset", "engine", "parse_mode", "started_at", "finished_at",
+    "elapsed", "feeds", "feed_errors", "found", "classified", "stored", "ai_failed",
+    "ai_calls", "ai_retries", "prompt_tokens", "output_tokens", "error",
+)
+FEED_STAT_COLUMNS = (
+    "feed", "status", "entries", "articles", "bytes",
+    "dns", "connect", "wait", "download", "parse", "strip", "total", "error",
+)
+
+
+def save_crawl_run(run: Dict, feeds: List[Dict], samples: List[tuple]) -> Optional[int]:
+    """크롤 실행 지표를 한 트랜잭션으로 저장, 실행 id 반환
+
+    run은 crawl_runs 컬럼(id·finished_at 제외), feeds는 FEED_STAT_COLUMNS 키의 dict,
+    samples는 (단계, 초) 튜플 목록.
+    """
+    columns = [c for c in _RUN_COLUMNS if c not in ("id", "finished_at") and c in run]
+    try:
+        with _connect() as conn:
+            run_id = conn.execute(
+                f"INSERT INTO crawl_runs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [run[c] for c in columns],
+            ).lastrowid
+            conn.executemany(
+                f"INSERT INTO feed_stats (run_id, {', '.join(FEED_STAT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in FEED_STAT_COLUMNS)})",
+                [(run_id, *(feed.get(c) for c in FEED_STAT_COLUMNS)) for feed in feeds],
+            )
+            conn.executemany(
+                "INSERT INTO stage_samples (run_id, stage, seconds) VALUES (?, ?, ?)",
+                [(run_id, stage, seconds) for stage, seconds in samples],
+            )
+        return run_id
+    except Exception as e:
+        logger.warning(f"⚠️ save_crawl_run 오류: {e}")
+        return None
+
+
+def get_crawl_runs(limit: int = 20) -> List[Dict]:
+    """최근 크롤 실행 기록 (최신 순)"""
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_RUN_COLUMNS)} FROM crawl_runs ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(zip(_RUN_COLUMNS, row)) for row in rows]
+    except Exception as e:
+        logger.warning(f"⚠️ get_crawl_runs 오류: {e}")
+        return []
+
+
+def get_feed_stats(run_ids: List[int]) -> List[Dict]:
+    """실행들의 피드별 지표"""
+    if not run_ids:
+        return []
+    try:
+        with _connect() as conn:
+            rows = conn.execute(
+                f"SELECT run_id, {', '.join(FEED_STAT_COLUMNS)} FROM feed_stats "
+                f"WHERE run_id IN ({', '.join('?' for _ in run_ids)})",
+                run_ids,
+            ).fetchall()
+        return [dict(zip(("run_id",) + FEED_STAT_COLUMNS, row)) for row in rows]
+    except Exception as e:
+        logger.warning(f"⚠️ get_feed_stats 오류: {e}")
+        return []
+
+
+def get_stage_samples(run_ids: List[int]) -> List[tuple]:
+    """실행들의 단계 표본 (단계, 초)"""
+    if not run_ids:
+        return []
+    try:
+        with _connect() as conn:
+            return conn.execute(
+                "SELECT stage, seconds FROM stage_samples "
+                f"WHERE run_id IN ({', '.join('?' for _ in run_ids)})",
+                run_ids,
+            ).fetchall()
+    except Exception as e:
+        logger.warning(f"⚠️ get_stage_samples 오류: {e}")
+        return []
+
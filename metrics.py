@@ -0,0 +1,234 @@
+"""
+크롤 성능 지표 - 단계별 소요 시간·AI 호출·토큰을 실행마다 DB(crawl_runs / feed_stats / stage_samples)에 기록
+
+    python metrics.py                  # 최근 20회 실행의 단계별·피드별 p50/p95
+    python metrics.py --runs 5 --json
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import db
+
+logger = logging.getLogger(__name__)
+
+# 피드별로 측정하는 단계 (crawler 결과의 timings 키). dns/connect는 async 엔진에서만 따로 잡히고
+# thread 엔진에서는 wait에 포함된다. total은 피드 하나의 요청~파싱 전체 시간.
+FEED_STAGES = ("dns", "connect", "wait", "download", "parse", "strip", "total")
+# 실행 단위로 표본을 남기는 단계 - AI 호출 지연, 속도 제한 대기, DB 쓰기 트랜잭션
+RUN_STAGES = ("ai_call", "ai_wait", "db_write")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """선형 보간 백분위수 (q: 0~100, 값이 없으면 None)"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = (len(values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+class RunMetrics:
+    """크롤 실행 한 번의 지표 수집기 (수집·분류·저장 스레드에서 동시에 호출)"""
+
+    def __init__(self):
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.feeds: List[Dict] = []
+        self.samples: List[tuple] = []
+        self.ai_calls = 0
+        self.ai_retries = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def record_feed(self, name: str, result: Dict):
+        """crawler 피드 결과 하나 기록 (기사 목록을 비우기 전에 호출)"""
+        timings = result.get("timings") or {}
+        row = {
+            "feed": name,
+            "status": result.get("status"),
+            "entries": result.get("entries"),
+            "articles": len(result.get("articles") or []),
+            "bytes": result.get("bytes"),
+            "error": result.get("error"),
+        }
+        row.update({stage: _round(timings.get(stage)) for stage in FEED_STAGES})
+        with self._lock:
+            self.feeds.append(row)
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.append((stage, round(seconds, 4)))
+
+    @contextmanager
+    def timer(self, stage: str):
+        """with 블록 소요 시간을 stage 표본으로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def record_ai_call(self, seconds: float, prompt_tokens: int, output_tokens: int, retry: bool):
+        """Gemini 요청 한 번 (실패·재시도 요청 포함) 기록"""
+        with self._lock:
+            self.samples.append(("ai_call", round(seconds, 4)))
+            self.ai_calls += 1
+            self.ai_retries += int(retry)
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+
+    def save(self, job: Dict, summary: Dict, engine: str, parse_mode: str) -> Optional[int]:
+        """crawl_jobs 작업 하나의 지표를 저장, 실행 id 반환"""
+        with self._lock:
+            feeds, samples = list(self.feeds), list(self.samples)
+            run = {
+                "job_id": job.get("id"),
+                "week_offset": job.get("week_offset"),
+                "engine": engine,
+                "parse_mode": parse_mode,
+                "started_at": self.started_at,
+                "elapsed": round(time.perf_counter() - self._started, 3),
+                "feeds": len(feeds),
+                "feed_errors": sum(1 for f in feeds if f["status"] == "error"),
+                "found": summary.get("found", 0),
+                "classified": summary.get("classified", 0),
+                "stored": summary.get("stored", 0),
+                "ai_failed": summary.get("ai_failed", 0),
+                "ai_calls": self.ai_calls,
+                "ai_retries": self.ai_retries,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "error": summary.get("error"),
+            }
+        return db.save_crawl_run(run, feeds, samples)
+
+
+def _stage_row(stage: str, values: List[float]) -> Dict:
+    values = [v for v in values if v is not None]
+    return {
+        "stage": stage,
+        "count": len(values),
+        "p50": _round(percentile(values, 50)),
+        "p95": _round(percentile(values, 95)),
+        "max": _round(max(values)) if values else None,
+        "total": _round(sum(values)),
+    }
+
+
+def build_report(runs: int = 20) -> Dict:
+    """최근 runs회 실행 기준 단계별·피드별 p50/p95 보고서
+
+    Returns:
+        {"runs": 실행 기록, "stages": 단계별 행, "feeds": 피드별 행 (p95 느린 순),
+         "ai": {"calls", "retries", "prompt_tokens", "output_tokens"}}
+    """
+    recent = db.get_crawl_runs(runs)
+    run_ids = [run["id"] for run in recent]
+    feed_rows = db.get_feed_stats(run_ids)
+
+    stage_values: Dict[str, List[float]] = {
+        ("feed_total" if stage == "total" else stage): [row[stage] for row in feed_rows]
+        for stage in FEED_STAGES
+    }
+    for stage in RUN_STAGES:
+        stage_values[stage] = []
+    for stage, seconds in db.get_stage_samples(run_ids):
+        stage_values.setdefault(stage, []).append(seconds)
+
+    by_feed: Dict[str, List[Dict]] = defaultdict(list)
+    for row in feed_rows:
+        by_feed[row["feed"]].append(row)
+    feeds = []
+    for name, rows in by_feed.items():
+        totals = [row["total"] for row in rows]
+        errors = [row for row in rows if row["status"] == "error"]
+        feeds.append({
+            "feed": name,
+            "runs": len(rows),
+            "errors": len(errors),
+            # 응답은 정상이지만 기간 안 entry가 하나도 없던 횟수
+            "empty": sum(1 for row in rows if row["status"] == "miss" and not row["entries"]),
+            "not_modified": sum(1 for row in rows if row["status"] == "hit"),
+            "articles": sum(row["articles"] or 0 for row in rows),
+            "p50": _round(percentile(totals, 50)),
+            "p95": _round(percentile(totals, 95)),
+            "download_p95": _round(percentile([row["download"] for row in rows], 95)),
+            "parse_p95": _round(percentile([row["parse"] for row in rows], 95)),
+            "last_error": errors[-1]["error"] if errors else None,
+        })
+    feeds.sort(key=lambda row: row["p95"] or 0, reverse=True)
+
+    return {
+        "runs": recent,
+        "stages": [_stage_row(stage, values) for stage, values in stage_values.items()],
+        "feeds": feeds,
+        "ai": {
+            key: sum(run[key] or 0 for run in recent)
+            for key in ("ai_calls", "ai_retries", "prompt_tokens", "output_tokens")
+        },
+    }
+
+
+def _table(rows: List[Dict], columns: List[str]) -> str:
+    cells = [[("-" if row[c] is None else str(row[c])) for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
+
+
+def format_report(report: Dict) -> str:
+    """build_report 결과를 터미널 표로"""
+    if not report["runs"]:
+        return "기록된 크롤 실행이 없습니다."
+    ai = report["ai"]
+    parts = [
+        f"📊 최근 {len(report['runs'])}회 실행 · AI 요청 {ai['ai_calls']}회 "
+        f"(재시도 {ai['ai_retries']}) · 토큰 입력 {ai['prompt_tokens']} / 출력 {ai['output_tokens']}",
+        "",
+        _table(report["runs"], [
+            "id", "week_offset", "engine", "parse_mode", "started_at", "elapsed",
+            "feeds", "feed_errors", "found", "stored", "ai_calls", "error",
+        ]),
+        "",
+        "단계별 (초)",
+        _table(report["stages"], ["stage", "count", "p50", "p95", "max", "total"]),
+        "",
+        "피드별 전체 시간 (초, p95 느린 순)",
+        _table(report["feeds"], [
+            "feed", "runs", "errors", "empty", "not_modified", "articles",
+            "p50", "p95", "download_p95", "parse_p95", "last_error",
+        ]),
+    ]
+    return "\n".join(parts)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="크롤 단계별·피드별 성능 보고서")
+    parser.add_argument("--runs", type=int, default=20, help="보고서에 포함할 최근 실행 수 (기본 20)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+    report = build_report(args.runs)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
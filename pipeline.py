@@ -0,0 +1,370 @@
+"""
+크롤 파이프라인 - RSS 수집 → 근접 중복 묶기 → AI 분류 → DB 저장 (Streamlit 없이 실행)
+"""
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config import WEBSITES
+import crawler
+from ai import AIProcessor, BATCH_SIZE, RESULT_FIELDS
+import crawl_coverage
+import db
+import dedup
+from metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+# 대표 기사를 이 수만큼 모아 분류·저장 (결과가 크롤 도중에도 화면에 보이도록 작게 유지)
+COMMIT_CHUNK = BATCH_SIZE * 4
+# 단계 사이 큐 크기 - 가득 차면 앞 단계가 기다리므로(배압) 메모리에 머무는 기사 수가 제한된다
+FEED_QUEUE_SIZE = 8
+ARTICLE_QUEUE_SIZE = COMMIT_CHUNK * 2
+# 동시에 분류 묶음을 처리하는 스레드 수 (요청 수 자체는 ai의 RateLimiter가 제한)
+CLASSIFY_WORKERS = 2
+# 분류 대기 기사가 COMMIT_CHUNK에 못 미쳐도 이 시간(초) 동안 새 기사가 없으면 바로 분류
+CLASSIFY_LINGER = 0.5
+
+Progress = Callable[..., None]
+
+_DONE = object()
+_timings_lock = threading.Lock()
+
+
+class _Stop(Exception):
+    """다른 단계가 실패해 파이프라인을 멈추는 중"""
+
+
+def _put(q: queue.Queue, item, abort: threading.Event):
+    """큐에 넣기 (가득 차면 대기, 중단되면 _Stop)"""
+    while not abort.is_set():
+        try:
+            q.put(item, timeout=0.2)
+            return
+        except queue.Full:
+            continue
+    raise _Stop()
+
+
+def _get(q: queue.Queue, abort: threading.Event, timeout: Optional[float] = None):
+    """큐에서 꺼내기 (timeout 동안 없으면 queue.Empty, 중단되면 _Stop)"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not abort.is_set():
+        wait = 0.2 if deadline is None else min(0.2, deadline - time.monotonic())
+        if wait <= 0:
+            raise queue.Empty()
+        try:
+            return q.get(timeout=wait)
+        except queue.Empty:
+            continue
+    raise _Stop()
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str):
+    """단계별 소요 시간 누적 (초)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _timings_lock:
+            timings[stage] = round(timings.get(stage, 0.0) + time.perf_counter() - started, 3)
+
+
+def _record_existing_duplicates(matched_existing: List[Tuple[Dict, Dict]]):
+    """이미 저장된 기사와 겹치는 기사는 분류 없이 다른 출처 링크로만 기록"""
+    alt_links: Dict[str, List[Dict]] = {}
+    for article, stored in matched_existing:
+        alt_links.setdefault(stored["link"], []).append(
+            {"source": article.get("source", ""), "link": article["link"]}
+        )
+    db.add_alt_links(alt_links)
+    db.mark_links_processed([a["link"] for a, _ in matched_existing])
+
+
+def crawl_week(
+    week_offset: int,
+    ai: AIProcessor,
+    websites: List[Dict] = WEBSITES,
+    progress: Optional[Progress] = None,
+    ai_budget: Optional[int] = None,
+    engine: str = crawler.CRAWL_ENGINE,
+    parse_mode: str = crawler.PARSE_MODE,
+    metrics: Optional[RunMetrics] = None,
+) -> Dict:
+    """한 주차 크롤을 단계별 스트리밍으로 실행
+
+    week_offset은 실행 시점 기준 주차(crawl_coverage.week_window)이고, 그 구간 중 피드별로 이미 수집한
+    구간(crawl_coverage)은 요청·분류하지 않는다. 끝까지 처리한 피드의 구간만 새로 기록하므로
+    수집 실패·분류 실패·AI 예산 초과가 있던 피드는 다음 크롤에서 같은 구간을 다시 수집한다.
+    수집·파싱·기존 링크 제외(crawler) → 근접 중복 묶기 → AI 분류 → 저장이 크기 제한 큐로
+    이어져 동시에 돌아간다. 피드 하나가 끝나면 바로 다음 단계로 넘어가고, 분류된 기사는
+    COMMIT_CHUNK 단위로 저장되므로 첫 기사가 빨리 보이고 중간에 멈춰도 저장된 만큼은 남는다.
+
+    progress가 있으면 단계마다 progress(feeds_done=..., articles_stored=...) 형태로
+    진행 상황을 알린다 (키는 db.update_crawl_job의 진행 컬럼과 같음).
+    ai_budget이 있으면 대표 기사를 최대 그 수만큼만 분류하고, 나머지는 처리 기록을 남기지 않아
+    다음 크롤에서 다시 수집된다.
+    metrics가 있으면 피드별 단계 시간, AI 요청 지연·토큰, DB 쓰기 시간을 기록한다.
+
+    Returns:
+        {"found", "classified", "stored", "ai_failed", "deferred", "first_store",
+         "timings": {"fetch", "dedup", "classify", "store"}}
+        단계가 겹쳐 돌아가므로 timings는 단계별 작업 시간이고, first_store는 첫 저장까지 걸린 시간(초)
+    """
+    report = progress or (lambda **_: None)
+    metrics = metrics or RunMetrics()
+    timings: Dict[str, float] = {"fetch": 0.0, "dedup": 0.0, "classify": 0.0, "store": 0.0}
+    summary = {
+        "found": 0, "classified": 0, "stored": 0, "ai_failed": 0, "deferred": 0,
+        "first_store": None, "timings": timings,
+    }
+    since_date, until_date = crawl_coverage.week_window(week_offset)
+    windows = crawl_coverage.plan(websites, since_date, until_date)
+    fetched: Set[str] = set()  # 수집에 성공한 피드 rss
+    incomplete: Set[str] = set()  # 분류 실패·예산 초과 기사가 있어 구간을 기록하면 안 되는 피드 이름
+    feed_caches: Dict[str, Dict] = {}  # 저장까지 끝난 뒤에 기록할 피드 캐시 {rss: 캐시}
+    started = time.perf_counter()
+
+    abort = threading.Event()
+    errors: List[Exception] = []
+    feed_q: queue.Queue = queue.Queue(FEED_QUEUE_SIZE)
+    classify_q: queue.Queue = queue.Queue(ARTICLE_QUEUE_SIZE)
+    commit_q: queue.Queue = queue.Queue(ARTICLE_QUEUE_SIZE)
+
+    def feed_done(site: Dict, status: str):
+        if status != "error":
+            fetched.add(site["rss"])
+
+    def fetch_stage():
+        with _timed(timings, "fetch"):
+            crawler.crawl_all(
+                websites, since_date, until_date, engine=engine, parse_mode=parse_mode,
+                progress=lambda done, total: report(feeds_done=done, feeds_total=total),
+                on_articles=lambda batch: _put(feed_q, batch, abort),
+                metrics=metrics,
+                windows=windows,
+                on_feed_done=feed_done,
+                pending_caches=feed_caches,
+            )
+
+    def dedup_stage():
+        # 이미 저장된 같은 기간 기사로 인덱스를 만들고, 새 기사는 들어오는 대로 대표/중복 판정
+        with _timed(timings, "dedup"):
+            existing = db.get_articles(since_date.isoformat(), until_date.isoformat())
+            index, backfill = dedup.build_index(existing)
+            db.save_minhashes(backfill)
+            existing_ids = {id(other) for other in existing}
+        representatives = 0
+        while True:
+            batch = _get(feed_q, abort)
+            if batch is _DONE:
+                break
+            to_classify, to_commit = [], []
+            with _timed(timings, "dedup"):
+                for article in batch:
+                    tokens = dedup.tokenize(dedup.article_text(article))
+                    dup = index.find_duplicate(article, tokens)
+                    if dup is None:
+                        if ai_budget is not None and representatives >= ai_budget:
+                            summary["deferred"] += 1
+                            incomplete.add(article.get("source", ""))
+                            continue
+                        index.add(article, tokens)
+                        representatives += 1
+                        to_classify.append(article)
+                    elif id(dup) in existing_ids:
+                        to_commit.append(("existing", article, dup))
+                    else:
+                        to_commit.append(("member", article, dup))
+            summary["found"] += len(batch)
+            report(articles_found=summary["found"], classify_total=representatives)
+            for article in to_classify:
+                _put(classify_q, article, abort)
+            for item in to_commit:
+                _put(commit_q, item, abort)
+        if summary["deferred"]:
+            logger.info(f"⏭️ AI 예산 초과로 대표 기사 {summary['deferred']}개는 다음 크롤로 미룸")
+
+    def classify_stage():
+        chunk: List[Dict] = []
+        finished = False
+        while not finished:
+            try:
+                item = _get(classify_q, abort, CLASSIFY_LINGER if chunk else None)
+            except queue.Empty:
+                item = None
+            if item is _DONE:
+                finished = True
+            elif item is not None:
+                chunk.append(item)
+            if chunk and (finished or item is None or len(chunk) >= COMMIT_CHUNK):
+                with _timed(timings, "classify"):
+                    processed = ai.process_articles_batched(chunk, metrics=metrics)
+                _put(commit_q, ("classified", processed), abort)
+                chunk = []
+
+    def run_stage(stage, done_queues):
+        try:
+            stage()
+        except _Stop:
+            return
+        except Exception as e:
+            logger.error(f"❌ 파이프라인 {stage.__name__} 오류: {e}")
+            errors.append(e)
+            abort.set()
+            return
+        try:
+            for q, count in done_queues:
+                for _ in range(count):
+                    _put(q, _DONE, abort)
+        except _Stop:
+            pass
+
+    threads = [
+        threading.Thread(target=run_stage, args=(fetch_stage, [(feed_q, 1)]), daemon=True),
+        threading.Thread(
+            target=run_stage,
+            args=(dedup_stage, [(classify_q, CLASSIFY_WORKERS), (commit_q, 1)]),
+            daemon=True,
+        ),
+    ] + [
+        threading.Thread(target=run_stage, args=(classify_stage, [(commit_q, 1)]), daemon=True)
+        for _ in range(CLASSIFY_WORKERS)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        _commit_stage(
+            commit_q, abort, 1 + CLASSIFY_WORKERS, summary, report, started, metrics, incomplete
+        )
+    except _Stop:
+        pass
+    except Exception:
+        abort.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    # 기사를 모두 저장·처리 기록한 피드만 캐시와 수집 구간을 남김 - 나머지는 다음 크롤이
+    # 304나 entry ID로 건너뛰지 않고 다시 받아 처리한다
+    names = {site["rss"]: site["name"] for site in websites}
+    db.save_feed_caches({
+        rss: cache for rss, cache in feed_caches.items() if names.get(rss) not in incomplete
+    })
+    crawl_coverage.record({
+        rss: windows[rss] for rss in fetched if names.get(rss) not in incomplete
+    })
+    return summary
+
+
+def _commit_stage(
+    commit_q: queue.Queue,
+    abort: threading.Event,
+    producers: int,
+    summary: Dict,
+    report: Progress,
+    started: float,
+    metrics: RunMetrics,
+    incomplete: Set[str],
+):
+    """분류 결과·중복 기록을 작은 트랜잭션 단위로 저장 (대표 기사 상태는 이 단계만 다룸)
+
+    분류에 실패한 대표와 그 중복 기사의 출처는 incomplete에 넣어 수집 구간을 기록하지 않게 한다.
+    """
+    timings = summary["timings"]
+    waiting_members: Dict[str, List[Dict]] = {}  # 대표 link → 대표보다 먼저 도착한 중복 기사
+    committed: Dict[str, bool] = {}  # 저장 끝난 대표 link → 분류 실패 여부
+    matched: List[Tuple[Dict, Dict]] = []  # (중복 기사, 저장된 기사)
+
+    def flush_matched():
+        with _timed(timings, "store"), metrics.timer("db_write"):
+            _record_existing_duplicates(matched)
+        matched.clear()
+
+    while producers:
+        item = _get(commit_q, abort)
+        if item is _DONE:
+            producers -= 1
+            continue
+        kind = item[0]
+        if kind == "existing":
+            matched.append((item[1], item[2]))
+        elif kind == "member":
+            member, rep = item[1], item[2]
+            if rep["link"] not in committed:
+                waiting_members.setdefault(rep["link"], []).append(member)
+            elif not committed[rep["link"]]:
+                # 대표가 이미 저장됨 - 기존 기사 중복과 같게 다른 출처 링크로 기록
+                matched.append((member, rep))
+            else:
+                # 대표 분류가 실패했으면 기록하지 않아 다음 크롤에서 대표와 함께 다시 처리
+                incomplete.add(member.get("source", ""))
+        else:
+            processed = item[1]
+            with _timed(timings, "store"), metrics.timer("db_write"):
+                for rep in processed:
+                    rep["duplicates"] = waiting_members.pop(rep["link"], [])
+                    if rep.get("ai_error"):
+                        incomplete.update(a.get("source", "") for a in [rep] + rep["duplicates"])
+                processed_all = dedup.spread_results(processed, RESULT_FIELDS)
+                # 분류 실패 기사는 기록하지 않아 다음 크롤에서 다시 분류
+                db.mark_links_processed([a["link"] for a in processed_all if not a.get("ai_error")])
+                final = [a for a in processed if a.get("is_europe_relevant")]
+                summary["stored"] += db.insert_articles(final)["inserted"]
+            for rep in processed:
+                committed[rep["link"]] = bool(rep.get("ai_error"))
+            summary["ai_failed"] += sum(1 for a in processed if a.get("ai_error"))
+            summary["classified"] += len(processed)
+            if summary["first_store"] is None and summary["stored"]:
+                summary["first_store"] = round(time.perf_counter() - started, 3)
+            report(
+                articles_classified=summary["classified"],
+                articles_stored=summary["stored"],
+                ai_failed=summary["ai_failed"],
+            )
+        if len(matched) >= COMMIT_CHUNK:
+            flush_matched()
+    if matched:
+        flush_matched()
+    if summary["found"]:
+        logger.info(
+            f"🧩 {summary['found']}개 기사 → 대표 {summary['classified']}개 분류, "
+            f"{summary['stored']}개 저장 (첫 저장 {summary['first_store']}s)"
+        )
+
+
+def run_job(job: Dict, ai: AIProcessor, **kwargs) -> Dict:
+    """crawl_jobs 작업 하나 실행 - 진행 상황과 종료 상태를 DB에 기록
+
+    kwargs는 crawl_week에 그대로 전달한다. 실패하면 summary["error"]에 메시지를 담아 반환한다.
+    성공·실패와 관계없이 실행 지표를 crawl_runs에 저장하고 그 id를 summary["run_id"]에 담는다.
+    """
+    job_id = job["id"]
+    logger.info(f"🚀 크롤 작업 #{job_id} 시작 (week_offset={job['week_offset']})")
+    metrics = RunMetrics()
+    try:
+        summary = crawl_week(
+            job["week_offset"], ai,
+            progress=lambda **fields: db.update_crawl_job(job_id, **fields),
+            metrics=metrics,
+            **kwargs,
+        )
+    except Exception as e:
+        logger.error(f"❌ 크롤 작업 #{job_id} 실패: {e}")
+        db.finish_crawl_job(job_id, error=str(e)[:200])
+        summary = {"error": str(e)[:200]}
+    else:
+        db.finish_crawl_job(job_id)
+        logger.info(f"✅ 크롤 작업 #{job_id} 완료: {summary}")
+    summary["run_id"] = metrics.save(
+        job, summary,
+        kwargs.get("engine", crawler.CRAWL_ENGINE), kwargs.get("parse_mode", crawler.PARSE_MODE),
+    )
+    return summary
@@ -0,0 +1,106 @@
+"""
+API 호출 속도 제한 - RPM/TPM 토큰 버킷 + AIMD 동시성 조절
+"""
+import logging
+import random
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """분당 요청 수(RPM)·토큰 수(TPM) 예산을 지키면서 동시 요청 수를 자동 조절
+
+    - 요청/토큰 버킷은 분당 예산만큼 연속적으로 채워진다.
+    - 성공하면 동시성 한도를 조금씩 늘리고(additive increase),
+      429/5xx를 받으면 절반으로 줄인다(multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self.decrease_cooldown = decrease_cooldown
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._in_flight = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int = 0):
+        """요청 1건과 tokens만큼의 예산이 생길 때까지 대기 후 슬롯 점유"""
+        tokens = min(tokens, self.tpm)
+        with self._cond:
+            while True:
+                self._refill()
+                if self._in_flight >= int(self.concurrency):
+                    self._cond.wait(timeout=1.0)
+                    continue
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    self._in_flight += 1
+                    return
+                wait = max(
+                    (1 - self._requests) * 60 / self.rpm,
+                    (tokens - self._tokens) * 60 / self.tpm,
+                )
+                self._cond.wait(timeout=max(wait, 0.01))
+
+    def release(self):
+        """점유한 슬롯 반환"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        """성공 응답: 동시성 한도 증가 (한도당 +1/한도, 즉 한 바퀴에 +1)"""
+        with self._cond:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self._cond.notify_all()
+
+    def on_throttle(self):
+        """429/5xx 응답: 동시성 한도 절반으로 감소 (동시에 몰린 실패는 한 번만 반영)"""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            logger.info(f"🐢 요청 제한 감지 → 동시성 {self.concurrency:.1f}")
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """지수 백오프 + full jitter 대기 시간 (초)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, rpm: int, tpm: int, max_concurrency: int = 8) -> RateLimiter:
+    """이름별로 프로세스 전체에서 공유되는 RateLimiter 반환"""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(rpm, tpm, max_concurrency=max_concurrency)
+        return _limiters[name]
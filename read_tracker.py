@@ -0,0 +1,81 @@
+"""
+읽음 기록 버퍼 - 렌더링 경로에서 DB 쓰기를 빼고 백그라운드에서 일괄 저장
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Set
+
+import db
+
+logger = logging.getLogger(__name__)
+
+
+class ReadTracker:
+    """읽은 기사 링크를 모아 두었다가 flush_interval마다 한 트랜잭션으로 저장
+
+    record()는 메모리에 추가만 하므로 렌더링을 막지 않는다.
+    프로세스 종료 시(atexit) 남은 기록을 모두 저장한다.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_pending: int = 500):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, Set[str]] = defaultdict(set)
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="read-tracker", daemon=True)
+        self._thread.start()
+
+    def record(self, api_key_hash: str, links: Iterable[str]):
+        """읽은 링크 추가 (즉시 반환)"""
+        with self._lock:
+            before = len(self._pending[api_key_hash])
+            self._pending[api_key_hash].update(links)
+            self._pending_count += len(self._pending[api_key_hash]) - before
+            if self._pending_count >= self.max_pending:
+                self._wake.set()
+
+    def flush(self):
+        """쌓인 기록을 사용자(api_key_hash)별 한 트랜잭션으로 저장, 실패분은 다시 대기열로"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(set)
+                self._pending_count = 0
+            for api_key_hash, links in pending.items():
+                if not db.mark_read_many(api_key_hash, sorted(links)):
+                    self.record(api_key_hash, links)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ 읽음 기록 저장 오류: {e}")
+
+    def close(self):
+        """백그라운드 스레드 종료 후 남은 기록 저장"""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker() -> ReadTracker:
+    """프로세스 전체에서 공유되는 ReadTracker 반환 (최초 호출 시 시작)"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ReadTracker()
+            atexit.register(_tracker.close)
+        return _tracker
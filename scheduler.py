@@ -0,0 +1,149 @@
+"""
+배치 크롤 스케줄러 - Streamlit 없이 크롤 → AI 분류 → DB 저장 실행 (GitHub Actions에서 매일 실행)
+
+    python scheduler.py                      # 최근 1주일 + 다음 1주일 미리 수집
+    python scheduler.py --weeks 0-2 --prefetch 0 --ai-budget 200
+
+실행 결과는 단계별 소요 시간을 포함한 JSON 요약으로 표준 출력에 찍는다.
+피드·AI 요청·DB 쓰기 지표는 작업마다 crawl_runs에 남으며 `python metrics.py`로 p50/p95를 본다.
+DB 파일은 DB_FILE 환경 변수 경로 - 미리 수집한 주차를 앱에서 보려면 앱과 같은 DB를 가리켜야 한다.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+import crawler
+from ai import AIProcessor
+from config import WEBSITES
+import crawl_coverage
+import db
+import pipeline
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "dedup", "classify", "store")
+
+
+def parse_weeks(spec: str) -> List[int]:
+    """"0", "0-2", "0,3,5" 형식의 주차 목록 파싱"""
+    weeks = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+            weeks.update(range(start, end + 1))
+        else:
+            weeks.add(int(part))
+    if not weeks or min(weeks) < 0:
+        raise argparse.ArgumentTypeError(f"잘못된 주차 범위: {spec}")
+    return sorted(weeks)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="RSS 크롤 + AI 분류 배치 실행")
+    parser.add_argument(
+        "--weeks", type=parse_weeks, default=[0],
+        help='크롤할 주차 (0=최근 7일). 예: "0", "0-2", "0,3" (기본 0)',
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=1,
+        help="요청 주차 이후 아직 수집하지 않은 주차를 미리 수집할 수 (기본 1)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="AI 동시 요청 수 상한 (기본 8)",
+    )
+    parser.add_argument(
+        "--ai-budget", type=int, default=None,
+        help="이번 실행에서 AI로 분류할 최대 기사 수 (초과분은 다음 실행으로 미룸)",
+    )
+    parser.add_argument(
+        "--engine", choices=("thread", "async"), default=crawler.CRAWL_ENGINE,
+        help="RSS 수집 방식 (기본: CRAWL_ENGINE 환경 변수 또는 thread)",
+    )
+    parser.add_argument(
+        "--parse-mode", choices=("thread", "process"), default=crawler.PARSE_MODE,
+        help="피드 파싱 방식 - process는 여러 코어에서 병렬 파싱 (기본: PARSE_MODE 환경 변수 또는 thread)",
+    )
+    parser.add_argument("--summary-file", help="JSON 요약을 저장할 파일 경로")
+    return parser
+
+
+# 미리 수집할 주차를 찾을 때 요청 주차 이후로 살펴볼 최대 주차 수
+PREFETCH_SCAN_WEEKS = 52
+
+
+def plan_weeks(weeks: List[int], prefetch: int) -> List[int]:
+    """요청 주차 + 그 이후 아직 수집 구간(crawl_coverage)이 비어 있는 주차 prefetch개"""
+    planned = set(weeks)
+    week = max(weeks)
+    while prefetch > 0 and week < max(weeks) + PREFETCH_SCAN_WEEKS:
+        week += 1
+        if not crawl_coverage.is_covered(WEBSITES, *crawl_coverage.week_window(week)):
+            planned.add(week)
+            prefetch -= 1
+    return sorted(planned)
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """작업 등록 후 대기열이 빌 때까지 실행, 실행 요약 반환"""
+    started = time.perf_counter()
+    api_key = os.environ.get("GEMINI_API_KEY", "")
+    if not api_key:
+        raise SystemExit("❌ GEMINI_API_KEY 환경 변수가 필요합니다")
+
+    db.init_db()
+    weeks = plan_weeks(args.weeks, args.prefetch)
+    for week in weeks:
+        db.enqueue_crawl_job(week)
+    ai = AIProcessor(api_key, max_concurrency=args.concurrency)
+
+    budget = args.ai_budget
+    jobs = []
+    totals = {"found": 0, "classified": 0, "stored": 0, "ai_failed": 0, "deferred": 0}
+    timings = {stage: 0.0 for stage in STAGES}
+    # 앱에서 등록한 뒤 처리되지 못한 작업도 함께 처리
+    while True:
+        job = db.claim_crawl_job()
+        if job is None:
+            break
+        summary = pipeline.run_job(
+            job, ai, ai_budget=budget, engine=args.engine, parse_mode=args.parse_mode
+        )
+        jobs.append({"job_id": job["id"], "week_offset": job["week_offset"], **summary})
+        for key in totals:
+            totals[key] += summary.get(key, 0)
+        for stage, seconds in summary.get("timings", {}).items():
+            timings[stage] = round(timings[stage] + seconds, 3)
+        if budget is not None:
+            budget = max(0, budget - summary.get("classified", 0))
+
+    return {
+        "weeks": weeks,
+        "jobs": jobs,
+        "totals": totals,
+        "failed_jobs": sum(1 for job in jobs if job.get("error")),
+        "timings": timings,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    result = run(args)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.summary_file:
+        with open(args.summary_file, "w", encoding="utf-8") as f:
+            f.write(output)
+    return 1 if result["failed_jobs"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+백그라운드 크롤 워커 - SQLite 작업 큐(crawl_jobs)에서 작업을 꺼내 pipeline.crawl_week 실행
+"""
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+import db
+
+if TYPE_CHECKING:
+    from ai import AIProcessor
+
+# ai(google.generativeai)·pipeline(crawler: feedparser, bs4, aiohttp)은 무거워서
+# 작업을 실제로 실행할 때 워커 스레드에서 import한다 (앱 첫 화면 로딩에 포함되지 않도록).
+
+logger = logging.getLogger(__name__)
+
+# 대기 작업이 없을 때 큐를 다시 확인하는 간격 (초)
+POLL_INTERVAL = 2.0
+# 이 시간(초)보다 오래 running으로 남은 작업은 중단된 것으로 보고 다시 실행
+# (scheduler.py 등 다른 프로세스가 실행 중인 작업은 건드리지 않도록)
+STALE_JOB_SECONDS = 3600
+
+
+class CrawlWorker:
+    """작업을 한 번에 하나씩 실행하는 데몬 스레드
+
+    API 키는 DB에 저장하지 않고 submit()에 넘긴 값을 메모리에만 보관한다.
+    키가 없는 작업(프로세스 재시작 전에 등록된 작업 등)은 GEMINI_API_KEY 환경 변수를 사용한다.
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._api_keys: Dict[int, str] = {}
+        self._processors: Dict[str, "AIProcessor"] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        requeued = db.requeue_running_crawl_jobs(STALE_JOB_SECONDS)
+        if requeued:
+            logger.info(f"🔁 중단된 크롤 작업 {requeued}개 다시 대기열로")
+        self._thread = threading.Thread(target=self._run, name="crawl-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, week_offset: int, api_key: str) -> Optional[int]:
+        """크롤 작업 등록 후 작업 id 반환 (같은 주차 작업이 진행 중이면 그 id)"""
+        job_id = db.enqueue_crawl_job(week_offset)
+        if job_id is not None:
+            with self._lock:
+                self._api_keys[job_id] = api_key
+            self._wake.set()
+        return job_id
+
+    def _processor(self, job_id: int) -> "AIProcessor":
+        from ai import AIProcessor
+
+        with self._lock:
+            api_key = self._api_keys.pop(job_id, None) or os.environ.get("GEMINI_API_KEY", "")
+            if not api_key:
+                raise RuntimeError("API 키 없음")
+            if api_key not in self._processors:
+                self._processors[api_key] = AIProcessor(api_key)
+            return self._processors[api_key]
+
+    def _run_job(self, job: Dict):
+        ai = self._processor(job["id"])
+        import pipeline
+
+        pipeline.run_job(job, ai)
+
+    def _run(self):
+        while True:
+            job = db.claim_crawl_job()
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            try:
+                self._run_job(job)
+            except Exception as e:
+                # 예외가 스레드 밖으로 나가면 작업이 running으로 남고 이후 작업도 실행되지 않음
+                logger.error(f"❌ 크롤 작업 #{job['id']} 실패: {e}")
+                db.finish_crawl_job(job["id"], error=str(e)[:200])
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> CrawlWorker:
+    """프로세스 전체에서 공유되는 CrawlWorker 반환 (최초 호출 시 시작)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = CrawlWorker()
+        return _worker